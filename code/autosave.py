@@ -0,0 +1,29 @@
+import settings
+
+
+class Autosave:
+	"""Saves the running level every `interval` seconds and whenever a new day
+	starts, but only if something was marked dirty since the last save.
+
+	Dirty parts are collected as they change (`Level.mark_dirty`), so a check
+	is a set lookup; nothing is serialized while the level is unchanged.
+	"""
+
+	def __init__(self, level, save, interval = None):
+		self.level = level
+		self.save = save
+		self.interval = settings.AUTOSAVE_INTERVAL if interval is None else interval
+		self.elapsed = 0.0
+		self.day = level.day
+
+	def update(self, dt):
+		self.elapsed += dt
+		new_day = self.level.day != self.day
+		if not new_day and (self.interval <= 0 or self.elapsed < self.interval):
+			return False
+		self.day = self.level.day
+		self.elapsed = 0.0
+		if not self.level.unsaved:
+			return False
+		self.save()
+		return True
@@ -0,0 +1,278 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+# keep stdout clean for the JSON report
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import pygame
+
+import settings
+import headless
+import save_system
+import timer
+
+# name -> function(level_factory, repeat) -> dict of results
+BENCHMARKS = {}
+
+
+def benchmark(name):
+	def register(func):
+		BENCHMARKS[name] = func
+		return func
+	return register
+
+
+def measure(func, repeat: int):
+	"""Call `func` `repeat` times and summarise wall time in milliseconds."""
+	samples = []
+	for _ in range(int(repeat)):
+		start = time.perf_counter()
+		func()
+		samples.append((time.perf_counter() - start) * 1000)
+	return {
+		'repeat': len(samples),
+		'min_ms': round(min(samples), 4),
+		'median_ms': round(statistics.median(samples), 4),
+		'mean_ms': round(statistics.fmean(samples), 4),
+		'max_ms': round(max(samples), 4),
+	}
+
+
+def farm_cells(level):
+	return list(level.soil_layer.soil_grid.positions('F'))
+
+
+def till_everything(level, water: bool = False, plant: str = None):
+	soil_layer = level.soil_layer
+	for x, y in farm_cells(level):
+		point = (x * settings.TILE_SIZE + settings.TILE_SIZE // 2, y * settings.TILE_SIZE + settings.TILE_SIZE // 2)
+		soil_layer.get_hit(point)
+		if water:
+			soil_layer.water(point)
+		if plant:
+			soil_layer.plant_seed(point, plant)
+
+
+@benchmark('camera_draw')
+def bench_camera_draw(new_level, repeat):
+	from sprites import Generic
+	from support import import_folder
+
+	results = {}
+	for extra in (0, 1000, 5000):
+		level = new_level()
+		surf = import_folder('../graphics/fruit/corn')[0]
+		width, height = level.soil_layer.soil_grid.width, level.soil_layer.soil_grid.height
+		layers = [settings.LAYERS['main'], settings.LAYERS['ground plant'], settings.LAYERS['rain floor']]
+		for _ in range(extra):
+			pos = (random.randint(0, width * settings.TILE_SIZE), random.randint(0, height * settings.TILE_SIZE))
+			Generic(pos, surf, level.all_sprites, random.choice(layers))
+		level.all_sprites.custom_draw(level.player)
+		result = measure(lambda: level.all_sprites.custom_draw(level.player), repeat)
+		result['sprites'] = len(level.all_sprites)
+		results[f'sprites+{extra}'] = result
+	return results
+
+
+@benchmark('player_collision')
+def bench_player_collision(new_level, repeat):
+	level = new_level()
+	player = level.player
+	obstacles = [sprite.hitbox for sprite in level.collision_sprites.sprites() if hasattr(sprite, 'hitbox')]
+	width, height = level.soil_layer.soil_grid.width, level.soil_layer.soil_grid.height
+
+	# collision-free starting points spread over the whole map
+	starts = []
+	while len(starts) < 200:
+		pos = (random.randint(0, width * settings.TILE_SIZE), random.randint(0, height * settings.TILE_SIZE))
+		player.hitbox.center = pos
+		if player.hitbox.collidelist(obstacles) == -1:
+			starts.append((pos, pygame.math.Vector2(random.choice((-1, 0, 1)), random.choice((-1, 0, 1)))))
+
+	def walk():
+		for pos, direction in starts:
+			player.pos.update(pos)
+			player.hitbox.center = pos
+			player.rect.center = pos
+			player.direction = direction.copy()
+			player.move(1 / 60)
+
+	result = measure(walk, repeat)
+	result['moves_per_call'] = len(starts)
+	result['collision_sprites'] = len(level.collision_sprites)
+	return result
+
+
+@benchmark('soil')
+def bench_soil(new_level, repeat):
+	results = {}
+	level = new_level()
+	cells = farm_cells(level)
+	fresh = new_level()
+	results['get_hit_full_farm'] = measure(lambda: till_everything(fresh), 1)
+	till_everything(level)
+	planted = new_level()
+	till_everything(planted)
+	results['water_plant_full_farm'] = measure(lambda: till_everything(planted, water=True, plant='corn'), 1)
+	results['create_soil_tiles_full_farm'] = measure(level.soil_layer.create_soil_tiles, repeat)
+	point = (cells[len(cells) // 2][0] * settings.TILE_SIZE + 1, cells[len(cells) // 2][1] * settings.TILE_SIZE + 1)
+	results['get_hit_tilled_cell'] = measure(lambda: level.soil_layer.get_hit(point), repeat)
+	results['cells'] = len(cells)
+	return results
+
+
+def planted_level(new_level):
+	level = new_level()
+	level.player.seed_inventory = {seed: 10 ** 6 for seed in level.player.seed_inventory}
+	till_everything(level, water=True, plant='corn')
+	return level
+
+
+@benchmark('level_state')
+def bench_level_state(new_level, repeat):
+	level = planted_level(new_level)
+	state = level.serialize_state()
+	state = json.loads(json.dumps(state))
+
+	def serialize_full():
+		level.state_cache.clear()
+		level.serialize_state()
+
+	return {
+		'serialize_state': measure(serialize_full, repeat),
+		'serialize_state_cached': measure(level.serialize_state, repeat),
+		'apply_state': measure(lambda: level.apply_state(state), max(1, repeat // 5)),
+		'plants': len(level.soil_layer.plant_sprites),
+	}
+
+
+@benchmark('growth')
+def bench_growth(new_level, repeat):
+	results = {}
+	results['night_full_farm'] = measure(planted_level(new_level).reset, 1)
+	level = planted_level(new_level)
+	results['advance_30_days_full_farm'] = measure(lambda: level.advance_days(30), 1)
+	results['plants'] = len(level.soil_layer.plant_sprites)
+	return results
+
+
+@benchmark('save_system')
+def bench_save_system(new_level, repeat):
+	level = planted_level(new_level)
+	payload = {'level': level.serialize_state()}
+	save_dir = tempfile.mkdtemp(prefix='meow_bench_')
+	save_system.set_save_dir(save_dir)
+	try:
+		write = measure(lambda: save_system.save_game_slot(1, payload), repeat)
+		read = measure(lambda: save_system.load_game_slot(1), repeat)
+		size = os.path.getsize(save_system._slot_path(1))
+	finally:
+		save_system.set_save_dir(None)
+		shutil.rmtree(save_dir, ignore_errors=True)
+	return {'write_slot': write, 'read_slot': read, 'slot_bytes': size}
+
+
+def git_revision():
+	try:
+		return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+	except Exception:
+		return None
+
+
+def medians(results, prefix=''):
+	"""Flatten nested results into {'group/case': median_ms}."""
+	flat = {}
+	for name, value in results.items():
+		if isinstance(value, dict):
+			if 'median_ms' in value:
+				flat[prefix + name] = value['median_ms']
+			else:
+				flat.update(medians(value, prefix + name + '/'))
+	return flat
+
+
+def compare(current, baseline_path: str, threshold: float) -> int:
+	with open(baseline_path, 'r', encoding='utf-8') as f:
+		baseline = json.load(f)
+	now = medians(current['results'])
+	before = medians(baseline.get('results', {}))
+	regressions = 0
+	for name in sorted(now):
+		if name not in before or before[name] <= 0:
+			continue
+		ratio = now[name] / before[name]
+		flag = ''
+		if ratio > threshold:
+			flag = '  REGRESSION'
+			regressions += 1
+		print(f'{name:45s} {before[name]:10.3f} -> {now[name]:10.3f} ms  x{ratio:5.2f}{flag}', file=sys.stderr)
+	return regressions
+
+
+def main(argv=None) -> int:
+	parser = argparse.ArgumentParser(description='Headless benchmarks for Meow Valley hot paths.')
+	parser.add_argument('--seed', type=int, default=1234)
+	parser.add_argument('--repeat', type=int, default=30)
+	parser.add_argument('--only', default=None, help='comma separated subset of: ' + ', '.join(BENCHMARKS))
+	parser.add_argument('--output', default=None, help='write JSON results to this file (default: stdout)')
+	parser.add_argument('--compare', default=None, help='earlier JSON results to compare medians against')
+	parser.add_argument('--threshold', type=float, default=1.25, help='median ratio counted as a regression')
+	args = parser.parse_args(argv)
+	output = os.path.abspath(args.output) if args.output else None
+	baseline = os.path.abspath(args.compare) if args.compare else None
+
+	os.chdir(os.path.dirname(os.path.abspath(__file__)))
+	headless.init_headless()
+	clock = headless.VirtualClock()
+	timer.set_clock(clock)
+	from level import Level
+
+	def new_level():
+		level = Level(headless=True)
+		level.raining = False
+		level.soil_layer.raining = False
+		return level
+
+	names = args.only.split(',') if args.only else list(BENCHMARKS)
+	results = {}
+	for name in names:
+		random.seed(args.seed)
+		results[name] = BENCHMARKS[name](new_level, args.repeat)
+
+	report = {
+		'meta': {
+			'revision': git_revision(),
+			'seed': args.seed,
+			'repeat': args.repeat,
+			'python': platform.python_version(),
+			'pygame': pygame.version.ver,
+			'platform': platform.platform(),
+			'timestamp': int(time.time()),
+		},
+		'results': results,
+	}
+	text = json.dumps(report, indent=2)
+	if output:
+		with open(output, 'w', encoding='utf-8') as f:
+			f.write(text)
+	else:
+		print(text)
+
+	status = 0
+	if baseline:
+		status = 1 if compare(report, baseline, args.threshold) else 0
+	timer.set_clock()
+	pygame.quit()
+	return status
+
+
+if __name__ == '__main__':
+	sys.exit(main())
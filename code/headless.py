@@ -0,0 +1,171 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+# keep stdout clean for the JSON report
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import pygame
+
+import settings
+import timer
+
+
+class ScriptedInput:
+	"""Keyboard state that scripts press/release; drop-in for `pygame.key.get_pressed`."""
+
+	def __init__(self):
+		self.pressed = set()
+
+	def __call__(self):
+		return self
+
+	def __getitem__(self, key):
+		return key in self.pressed
+
+	def press(self, *keys):
+		self.pressed.update(keys)
+
+	def release(self, *keys):
+		self.pressed.difference_update(keys)
+
+	def release_all(self):
+		self.pressed.clear()
+
+
+class VirtualClock:
+	"""Millisecond clock that only moves when the simulation steps."""
+
+	def __init__(self, start_ms: int = 1000):
+		# Timer treats start_time == 0 as "never started", so don't begin at 0.
+		self.ms = float(start_ms)
+
+	def __call__(self) -> int:
+		return int(self.ms)
+
+	def advance(self, dt: float) -> None:
+		self.ms += dt * 1000
+
+
+def init_headless(audio: bool = False) -> None:
+	"""Initialise pygame with SDL dummy drivers (no window, no sound device).
+
+	Without `audio` the mixer stays uninitialised and `support.load_sound`
+	hands out silent stand-ins.
+	"""
+	os.environ['SDL_VIDEODRIVER'] = 'dummy'
+	os.environ['SDL_AUDIODRIVER'] = 'dummy'
+	pygame.display.init()
+	pygame.font.init()
+	if audio:
+		try:
+			pygame.mixer.init()
+		except Exception:
+			pass
+	# `convert_alpha()` needs a display mode, even a dummy one.
+	pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+
+
+class HeadlessRunner:
+	"""Drive a `Level` with a fixed `dt` as fast as the CPU allows."""
+
+	def __init__(self, dt: float = 1 / 60, render: bool = False, audio: bool = False, level_state=None):
+		init_headless(audio=audio)
+		self.clock = VirtualClock()
+		timer.set_clock(self.clock)
+
+		from level import Level
+		self.level = Level(headless=True)
+		self.input = ScriptedInput()
+		self.level.set_input_source(self.input)
+		if level_state is not None:
+			self.level.apply_state(level_state)
+
+		self.dt = float(dt)
+		self.render = bool(render)
+		self.ticks = 0
+		self.days = 0
+		self.tick_seconds = 0.0
+
+	def step(self, frames: int = 1) -> None:
+		for _ in range(int(frames)):
+			self.clock.advance(self.dt)
+			start = time.perf_counter()
+			if self.render:
+				self.level.run(self.dt)
+			else:
+				self.level.simulate(self.dt)
+			self.tick_seconds += time.perf_counter() - start
+			self.ticks += 1
+
+	def sleep(self, max_frames: int = 10000) -> None:
+		"""Go to bed and step until the night transition has finished."""
+		self.level.player.sleep = True
+		frames = 0
+		while self.level.player.sleep and frames < max_frames:
+			self.step()
+			frames += 1
+		self.days += 1
+
+	def run_days(self, days: int) -> None:
+		for _ in range(int(days)):
+			self.sleep()
+
+	def skip_days(self, days: int) -> None:
+		"""Fast-forward `days` nights in one call, without stepping the night transition."""
+		if days > 0:
+			self.level.advance_days(days)
+			self.days += int(days)
+
+	def stats(self):
+		return {
+			'ticks': self.ticks,
+			'days': self.days,
+			'dt': self.dt,
+			'render': self.render,
+			'tick_seconds': round(self.tick_seconds, 6),
+			'ticks_per_second': round(self.ticks / self.tick_seconds, 2) if self.tick_seconds > 0 else None,
+			'sprites': len(self.level.all_sprites),
+		}
+
+	def close(self) -> None:
+		timer.set_clock()
+
+
+def main(argv=None) -> int:
+	parser = argparse.ArgumentParser(description='Run Meow Valley without a window at a fixed timestep.')
+	parser.add_argument('--days', type=int, default=10, help='in-game days to simulate')
+	parser.add_argument('--skip-days', type=int, default=0, help='in-game days to fast-forward in one call before simulating')
+	parser.add_argument('--frames', type=int, default=0, help='extra fixed-dt ticks to run before sleeping')
+	parser.add_argument('--dt', type=float, default=1 / 60, help='fixed timestep in seconds')
+	parser.add_argument('--seed', type=int, default=None)
+	parser.add_argument('--render', action='store_true', help='also draw every tick (to an off-screen surface)')
+	parser.add_argument('--profile', metavar='DIR', default=None, help='record per-phase timings and write a JSON/CSV trace to DIR')
+	args = parser.parse_args(argv)
+	profile_dir = os.path.abspath(args.profile) if args.profile else None
+
+	# Relative asset paths in the game code are resolved from `code/`.
+	os.chdir(os.path.dirname(os.path.abspath(__file__)))
+	if args.seed is not None:
+		random.seed(args.seed)
+
+	runner = HeadlessRunner(dt=args.dt, render=args.render)
+	if profile_dir:
+		runner.level.profiler.enabled = True
+	try:
+		runner.skip_days(args.skip_days)
+		runner.step(args.frames)
+		runner.run_days(args.days)
+		print(json.dumps(runner.stats()))
+		if profile_dir:
+			print(runner.level.profiler.export(profile_dir))
+	finally:
+		runner.close()
+		pygame.quit()
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
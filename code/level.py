@@ -1,9 +1,10 @@
 import pygame 
+import settings
 from settings import *
 from player import Player
 from overlay import Overlay
-from sprites import Generic, Water, WildFlower, Tree, Interaction, Particle
-from pytmx.util_pygame import load_pygame
+from sprites import Generic, Collider, Water, WildFlower, Tree, Interaction, Particle
+from mapcache import load_map
 from support import *
 from transition import Transition
 from soil import SoilLayer
@@ -11,20 +12,27 @@ from soil import Plant, WaterTile
 from sky import Rain, Sky
 from random import randint, choice
 from menu import Menu
+from spatial import CollisionGroup
+from profiler import Profiler
 
 class Level:
-	def __init__(self):
+	def __init__(self, headless = False):
 
 		# get the display surface
 		self.display_surface = pygame.display.get_surface()
 
 		# sprite groups
 		self.all_sprites = CameraGroup()
-		self.collision_sprites = pygame.sprite.Group()
+		self.collision_sprites = CollisionGroup()
 		self.tree_sprites = pygame.sprite.Group()
 		self.interaction_sprites = pygame.sprite.Group()
 
-		self.soil_layer = SoilLayer(self.all_sprites, self.collision_sprites)
+		# Saved parts ('inventory', 'soil', 'plants', 'trees') changed since the
+		# last save, and serialized parts that are still valid (see serialize_state).
+		self.unsaved = set()
+		self.state_cache = {}
+
+		self.soil_layer = SoilLayer(self.all_sprites, self.collision_sprites, self.mark_dirty)
 		self.setup()
 		self.overlay = Overlay(self.player)
 		self.transition = Transition(self.reset, self.player)
@@ -39,14 +47,47 @@ class Level:
 		self.menu = Menu(self.player, self.toggle_shop)
 		self.shop_active = False
 
+		# progress shown in the save slot list
+		self.day = 1
+		self.play_time = 0.0
+
+		# opt-in frame profiling (F3 in game)
+		self.profiler = Profiler()
+
 		# music
-		self.success = pygame.mixer.Sound('../audio/success.wav')
-		self.success.set_volume(SFX_VOLUME)
-		self.music = pygame.mixer.Sound('../audio/music.mp3')
-		self.music.set_volume(MUSIC_VOLUME)
-		self.music.play(loops = -1)
+		self.success = load_sound('../audio/success.wav')
+		self.success.set_volume(settings.SFX_VOLUME)
+		self.music = load_sound('../audio/music.mp3')
+		self.music.set_volume(settings.MUSIC_VOLUME)
+		if not headless:
+			self.music.play(loops = -1)
+
+	def set_input_source(self, input_source):
+		self.player.input_source = input_source
+		self.menu.input_source = input_source
+
+	def mark_dirty(self, part):
+		"""Record that a saved part ('inventory', 'soil', 'plants' or 'trees') changed.
+
+		The player, soil layer and trees get this as a callback and call it on
+		every change that would show up in a save, so only the changed parts
+		are serialized and written again.
+		"""
+		self.unsaved.add(part)
+		self.state_cache.pop(part, None)
+
+	def cached_state(self, part, serialize):
+		# Parts are rebuilt only after mark_dirty(part); a cached part is never
+		# mutated, so consecutive snapshots can share it.
+		if part not in self.state_cache:
+			self.state_cache[part] = serialize()
+		return self.state_cache[part]
 
 	def serialize_state(self):
+		# Only fresh (or cached, never mutated) containers go in here, so the
+		# result is a snapshot that a background save can encode while the
+		# game keeps running.
+
 		# Player
 		player_state = {
 			'pos': [int(self.player.rect.centerx), int(self.player.rect.centery)],
@@ -59,6 +100,26 @@ class Level:
 		}
 
 		# Soil & plants
+		soil_state = {
+			'grid': self.cached_state('soil', lambda: self.soil_layer.grid),
+			'plants': self.cached_state('plants', self.serialize_plants),
+		}
+
+		# Trees
+		trees = self.cached_state('trees', self.serialize_trees)
+
+		return {
+			'day': int(self.day),
+			'play_time': round(float(self.play_time), 3),
+			'player': player_state,
+			'shop_active': bool(self.shop_active),
+			'raining': bool(self.raining),
+			'sky_start_color': list(self.sky.start_color),
+			'soil': soil_state,
+			'trees': trees,
+		}
+
+	def serialize_plants(self):
 		plants = []
 		for plant in self.soil_layer.plant_sprites.sprites():
 			try:
@@ -72,32 +133,47 @@ class Level:
 				'age': float(plant.age),
 				'harvestable': bool(plant.harvestable),
 			})
+		return plants
 
-		soil_state = {
-			'grid': self.soil_layer.grid,
-			'plants': plants,
-		}
-
-		# Trees
+	def serialize_trees(self):
 		trees = []
 		for tree in self.tree_sprites.sprites():
 			try:
 				trees.append(tree.serialize_state())
 			except Exception:
 				pass
-
-		return {
-			'player': player_state,
-			'shop_active': bool(self.shop_active),
-			'raining': bool(self.raining),
-			'sky_start_color': list(self.sky.start_color),
-			'soil': soil_state,
-			'trees': trees,
-		}
+		return trees
 
 	def apply_state(self, state):
 		if not isinstance(state, dict):
 			return
+		self.apply_saved_state(state)
+		# the level now matches what was loaded: nothing unsaved, nothing cached
+		self.state_cache.clear()
+		self.unsaved.clear()
+
+	def load_state(self, state):
+		"""Replace the running world with a saved one, in place.
+
+		The map, sprites' assets, groups and music are kept; only mutable
+		world state is reset and then restored via apply_state().
+		"""
+		self.player.direction.update(0, 0)
+		for timer in self.player.timers.values():
+			timer.deactivate()
+		self.transition.color = 255
+		self.transition.speed = -2
+		self.rain.clear()
+		self.apply_state(state)
+
+	def apply_saved_state(self, state):
+
+		try:
+			# slots written before day/play_time were saved start over, also when loaded in place
+			self.day = max(1, int(state.get('day', 1)))
+			self.play_time = max(0.0, float(state.get('play_time', 0.0)))
+		except Exception:
+			pass
 
 		# Shop / weather / sky
 		self.shop_active = bool(state.get('shop_active', False))
@@ -156,7 +232,6 @@ class Level:
 			if isinstance(grid, list) and grid:
 				try:
 					self.soil_layer.grid = grid
-					self.soil_layer.create_hit_rects()
 					self.soil_layer.create_soil_tiles()
 				except Exception:
 					pass
@@ -171,17 +246,13 @@ class Level:
 
 			# Recreate water sprites from grid
 			try:
-				for y, row in enumerate(self.soil_layer.grid):
-					for x, cell in enumerate(row):
-						if isinstance(cell, list) and 'W' in cell:
-							WaterTile((x * TILE_SIZE, y * TILE_SIZE), choice(self.soil_layer.water_surfs), [self.all_sprites, self.soil_layer.water_sprites])
+				for x, y in self.soil_layer.soil_grid.positions('W'):
+					WaterTile((x * TILE_SIZE, y * TILE_SIZE), choice(self.soil_layer.water_surfs), [self.all_sprites, self.soil_layer.water_sprites])
 			except Exception:
 				pass
 
-			# Map soil sprites by grid position
-			soil_by_grid = {}
-			for soil_sprite in self.soil_layer.soil_sprites.sprites():
-				soil_by_grid[(int(soil_sprite.rect.x // TILE_SIZE), int(soil_sprite.rect.y // TILE_SIZE))] = soil_sprite
+			# Soil sprites by grid position
+			soil_by_grid = self.soil_layer.soil_sprites.cells
 
 			# Recreate plants
 			plants = soil_state.get('plants', [])
@@ -199,22 +270,18 @@ class Level:
 						continue
 					# Ensure grid has 'P'
 					try:
-						cell = self.soil_layer.grid[gy][gx]
-						if isinstance(cell, list) and 'P' not in cell:
-							cell.append('P')
+						self.soil_layer.soil_grid.set(gx, gy, 'P')
 					except Exception:
 						pass
 
-					plant = Plant(ptype, [self.all_sprites, self.soil_layer.plant_sprites, self.collision_sprites], soil_sprite, self.soil_layer.check_watered)
+					plant = Plant(ptype, [self.all_sprites, self.soil_layer.plant_sprites, self.collision_sprites], soil_sprite, self.soil_layer.ripe_sprites)
 					try:
 						plant.age = float(plant_info.get('age', 0))
 						plant.age = max(0.0, min(plant.age, float(plant.max_age)))
-						plant.harvestable = bool(plant_info.get('harvestable', False))
+						if plant_info.get('harvestable', False):
+							plant.ripen()
 						if int(plant.age) > 0:
-							plant.z = LAYERS['main']
-							plant.hitbox = plant.rect.copy().inflate(-26, -plant.rect.height * 0.4)
-						plant.image = plant.frames[int(plant.age)]
-						plant.rect = plant.image.get_rect(midbottom=soil_sprite.rect.midbottom + pygame.math.Vector2(0, plant.y_offset))
+							plant.set_stage(int(plant.age))
 					except Exception:
 						pass
 
@@ -223,8 +290,8 @@ class Level:
 		if isinstance(trees, list) and trees:
 			index = {}
 			for tree in self.tree_sprites.sprites():
-				key = (getattr(tree, 'name', None), int(tree.rect.x), int(tree.rect.y))
-				index[key] = tree
+				for key in tree.state_keys():
+					index[key] = tree
 			for tstate in trees:
 				if not isinstance(tstate, dict):
 					continue
@@ -242,45 +309,41 @@ class Level:
 					pass
 
 	def setup(self):
-		tmx_data = load_pygame('../data/map.tmx')
+		map_data = load_map('../data/map.tmx')
 
-		# house 
-		for layer in ['HouseFloor', 'HouseFurnitureBottom']:
-			for x, y, surf in tmx_data.get_layer_by_name(layer).tiles():
-				Generic((x * TILE_SIZE,y * TILE_SIZE), surf, self.all_sprites, LAYERS['house bottom'])
-
-		for layer in ['HouseWalls', 'HouseFurnitureTop']:
-			for x, y, surf in tmx_data.get_layer_by_name(layer).tiles():
-				Generic((x * TILE_SIZE,y * TILE_SIZE), surf, self.all_sprites)
+		# house + fence, pre-rendered in chunks (see mapcache.STATIC_LAYERS)
+		for layer in ['house bottom', 'main']:
+			for pos, surf in map_data.static_surfaces(layer):
+				Generic(pos, surf, self.all_sprites, LAYERS[layer])
 
 		# Fence
-		for x, y, surf in tmx_data.get_layer_by_name('Fence').tiles():
-			Generic((x * TILE_SIZE,y * TILE_SIZE), surf, [self.all_sprites, self.collision_sprites])
+		for hitbox in map_data.hitboxes('Fence'):
+			Collider(hitbox, self.collision_sprites)
 
 		# water 
 		water_frames = import_folder('../graphics/water')
-		for x, y, surf in tmx_data.get_layer_by_name('Water').tiles():
-			Water((x * TILE_SIZE,y * TILE_SIZE), water_frames, self.all_sprites)
+		self.water = Water([(x * TILE_SIZE, y * TILE_SIZE) for x, y in map_data.cells('Water')], water_frames, self.all_sprites)
 
 		# trees 
-		for obj in tmx_data.get_layer_by_name('Trees'):
+		for obj in map_data.objects('Trees'):
 			Tree(
 				pos = (obj.x, obj.y), 
 				surf = obj.image, 
 				groups = [self.all_sprites, self.collision_sprites, self.tree_sprites], 
 				name = obj.name,
-				player_add = self.player_add)
+				player_add = self.player_add,
+				mark_dirty = self.mark_dirty)
 
 		# wildflowers 
-		for obj in tmx_data.get_layer_by_name('Decoration'):
+		for obj in map_data.objects('Decoration'):
 			WildFlower((obj.x, obj.y), obj.image, [self.all_sprites, self.collision_sprites])
 
 		# collion tiles
-		for x, y, surf in tmx_data.get_layer_by_name('Collision').tiles():
-			Generic((x * TILE_SIZE, y * TILE_SIZE), pygame.Surface((TILE_SIZE, TILE_SIZE)), self.collision_sprites)
+		for hitbox in map_data.hitboxes('Collision'):
+			Collider(hitbox, self.collision_sprites)
 
 		# Player 
-		for obj in tmx_data.get_layer_by_name('Player'):
+		for obj in map_data.objects('Player'):
 			if obj.name == 'Start':
 				self.player = Player(
 					pos = (obj.x,obj.y), 
@@ -289,7 +352,8 @@ class Level:
 					tree_sprites = self.tree_sprites,
 					interaction = self.interaction_sprites,
 					soil_layer = self.soil_layer,
-					toggle_shop = self.toggle_shop)
+					toggle_shop = self.toggle_shop,
+					mark_dirty = self.mark_dirty)
 			
 			if obj.name == 'Bed':
 				Interaction((obj.x,obj.y), (obj.width,obj.height), self.interaction_sprites, obj.name)
@@ -300,15 +364,16 @@ class Level:
 
 		Generic(
 			pos = (0,0),
-			surf = pygame.image.load('../graphics/world/ground.png').convert_alpha(),
+			surf = load_image('../graphics/world/ground.png'),
 			groups = self.all_sprites,
 			z = LAYERS['ground'])
 
 	def player_add(self,item):
 
 		self.player.item_inventory[item] += 1
+		self.mark_dirty('inventory')
 		try:
-			self.success.set_volume(SFX_VOLUME)
+			self.success.set_volume(settings.SFX_VOLUME)
 		except Exception:
 			pass
 		self.success.play()
@@ -318,12 +383,25 @@ class Level:
 		self.shop_active = not self.shop_active
 
 	def reset(self):
+		self.advance_days(1)
+
+	def advance_days(self, days):
+		"""Sleep through `days` nights in one call; the night transition uses 1.
+
+		Plants grow on every watered night. After the first night only rain
+		waters the soil, so the rain of the skipped days is rolled up front and
+		handed to the soil layer as a count.
+		"""
+		days = max(1, int(days))
+		rain = [randint(0,10) > 7 for _ in range(days)]
+		self.day += days
+
 		# plants
-		self.soil_layer.update_plants()
+		self.soil_layer.update_plants(rainy_nights = sum(rain[:-1]))
 
 		# soil
 		self.soil_layer.remove_water()
-		self.raining = randint(0,10) > 7
+		self.raining = rain[-1]
 		self.soil_layer.raining = self.raining
 		if self.raining:
 			self.soil_layer.water_all()
@@ -333,64 +411,198 @@ class Level:
 			for apple in tree.apple_sprites.sprites():
 				apple.kill()
 			tree.create_fruit()
+		self.mark_dirty('trees')
 
 		# sky
 		self.sky.start_color = [255,255,255]
 
 	def plant_collision(self):
-		if self.soil_layer.plant_sprites:
-			for plant in self.soil_layer.plant_sprites.sprites():
-				if plant.harvestable and plant.rect.colliderect(self.player.hitbox):
-					self.player_add(plant.plant_type)
-					plant.kill()
-					Particle(plant.rect.topleft, plant.image, self.all_sprites, z = LAYERS['main'])
-					self.soil_layer.grid[plant.rect.centery // TILE_SIZE][plant.rect.centerx // TILE_SIZE].remove('P')
+		# only ripe plants in the cells around the player are tested
+		for plant in self.soil_layer.ripe_plants_near(self.player.hitbox):
+			if plant.rect.colliderect(self.player.hitbox):
+				self.player_add(plant.plant_type)
+				plant.kill()
+				Particle.emit(plant.rect.topleft, plant.image, self.all_sprites, z = LAYERS['main'])
+				self.soil_layer.soil_grid.clear(*plant.cell, 'P')
+				self.mark_dirty('soil')
+				self.mark_dirty('plants')
+
+	def count_sprites(self):
+		self.profiler.count_sprites({
+			'all_sprites': self.all_sprites,
+			'collision_sprites': self.collision_sprites,
+			'tree_sprites': self.tree_sprites,
+			'soil_sprites': self.soil_layer.soil_sprites,
+			'water_sprites': self.soil_layer.water_sprites,
+			'plant_sprites': self.soil_layer.plant_sprites,
+		}, self.all_sprites)
+		self.profiler.count('rain_drops', len(self.rain))
+
+	def step(self, dt):
+		# one tick of game logic, shared by run() and simulate()
+		profiler = self.profiler
+		self.play_time += dt
 
-	def run(self,dt):
-		
-		# drawing logic
-		self.display_surface.fill('black')
-		self.all_sprites.custom_draw(self.player)
-		
-		# updates
 		if self.shop_active:
-			self.menu.update()
+			with profiler.section('menu'):
+				self.menu.input()
 		else:
-			self.all_sprites.update(dt)
-			self.plant_collision()
+			with profiler.section('update'):
+				self.all_sprites.update(dt)
+				self.water.update(dt)
+			with profiler.section('plant_collision'):
+				self.plant_collision()
+			with profiler.section('rain'):
+				self.rain.update(dt, spawn = self.raining)
+
+		with profiler.section('sky'):
+			self.sky.update(dt)
 
-		# weather
-		self.overlay.display()
-		if self.raining and not self.shop_active:
-			self.rain.update()
-		self.sky.display(dt)
+		if self.player.sleep:
+			with profiler.section('transition'):
+				self.transition.update()
+
+	def draw_world(self):
+		with self.profiler.section('draw'):
+			self.display_surface.fill('black')
+			self.all_sprites.custom_draw(self.player)
 
-		# transition overlay
+	def draw_hud(self):
+		# shop, tool overlay, sky tint and night fade, drawn over the world
+		profiler = self.profiler
+		if self.shop_active:
+			with profiler.section('menu'):
+				self.menu.display()
+		with profiler.section('overlay'):
+			self.overlay.display()
+		with profiler.section('sky'):
+			self.sky.draw()
 		if self.player.sleep:
-			self.transition.play()
+			with profiler.section('transition'):
+				self.transition.draw()
+
+	def simulate(self, dt):
+		# same as run(), minus every draw call
+		self.profiler.begin_frame(dt)
+		self.step(dt)
+		if self.profiler.enabled:
+			self.count_sprites()
+		self.profiler.end_frame()
+
+	def run(self,dt):
+		profiler = self.profiler
+		profiler.begin_frame(dt)
+		self.draw_world()
+		self.step(dt)
+		self.draw_hud()
+		if profiler.enabled:
+			self.count_sprites()
+		profiler.end_frame()
+		profiler.draw_overlay(self.display_surface)
+
+	def resize(self):
+		"""Follow a new window size. Only the screen-sized surfaces and layout are
+		rebuilt; sprites, soil, timers and music carry on untouched."""
+		self.display_surface = pygame.display.get_surface()
+		self.all_sprites.resize()
+		self.overlay.resize()
+		self.sky.resize()
+		self.transition.resize()
+		self.menu.resize()
+
+	def draw_still(self):
+		# one frame of the current world without advancing anything (pause background)
+		self.draw_world()
+		self.draw_hud()
 
 class CameraGroup(pygame.sprite.Group):
 	def __init__(self):
 		super().__init__()
-		self.display_surface = pygame.display.get_surface()
 		self.offset = pygame.math.Vector2()
+		self.resize()
+
+		# z-layer buckets (dicts keep insertion order and give O(1) removal)
+		self.layers = {layer: {} for layer in sorted(LAYERS.values())}
+		self.y_sorted_layers = {LAYERS['main'], LAYERS['fruit']}
+		# Sprites are added before their `z` is assigned (see Generic.__init__),
+		# so new members are bucketed lazily on the next draw.
+		self.pending = {}
+		self.sprite_layer = {}
+
+		# non-sprite batch renderers (e.g. rain) drawn right after their layer's sprites
+		self.layer_drawers = {}
+
+	def resize(self):
+		self.display_surface = pygame.display.get_surface()
+		self.half_width = settings.SCREEN_WIDTH / 2
+		self.half_height = settings.SCREEN_HEIGHT / 2
+		self.view_size = (settings.SCREEN_WIDTH + 1, settings.SCREEN_HEIGHT + 1)
+
+	def add_layer_drawer(self, layer, draw):
+		self.layer_drawers.setdefault(layer, []).append(draw)
+
+	def add_internal(self, sprite, layer = None):
+		super().add_internal(sprite, layer)
+		if sprite not in self.sprite_layer:
+			self.pending[sprite] = None
+
+	def remove_internal(self, sprite):
+		super().remove_internal(sprite)
+		self.pending.pop(sprite, None)
+		layer = self.sprite_layer.pop(sprite, None)
+		if layer is not None:
+			self.layers[layer].pop(sprite, None)
+
+	def bucket(self, sprite, layer):
+		self.sprite_layer[sprite] = layer
+		self.layers.setdefault(layer, {})[sprite] = None
+
+	def flush_pending(self):
+		if self.pending:
+			for sprite in self.pending:
+				self.bucket(sprite, sprite.z)
+			self.pending.clear()
+			# keep draw order ascending if an unknown z showed up
+			if list(self.layers) != sorted(self.layers):
+				self.layers = {layer: self.layers[layer] for layer in sorted(self.layers)}
+
+	def visible_sprites(self, layer, bucket, camera_rect):
+		visible = []
+		moved = []
+		for sprite in bucket:
+			# plants change `z` as they grow; re-bucket them on the fly
+			if sprite.z != layer:
+				moved.append(sprite)
+				continue
+			if sprite.rect.colliderect(camera_rect):
+				visible.append(sprite)
+		for sprite in moved:
+			del bucket[sprite]
+			self.bucket(sprite, sprite.z)
+		if layer in self.y_sorted_layers:
+			visible.sort(key = lambda sprite: sprite.rect.centery)
+		return visible
 
 	def custom_draw(self, player):
-		self.offset.x = player.rect.centerx - SCREEN_WIDTH / 2
-		self.offset.y = player.rect.centery - SCREEN_HEIGHT / 2
-
-		for layer in LAYERS.values():
-			for sprite in sorted(self.sprites(), key = lambda sprite: sprite.rect.centery):
-				if sprite.z == layer:
-					offset_rect = sprite.rect.copy()
-					offset_rect.center -= self.offset
-					self.display_surface.blit(sprite.image, offset_rect)
-
-					# # anaytics
-					# if sprite == player:
-					# 	pygame.draw.rect(self.display_surface,'red',offset_rect,5)
-					# 	hitbox_rect = player.hitbox.copy()
-					# 	hitbox_rect.center = offset_rect.center
-					# 	pygame.draw.rect(self.display_surface,'green',hitbox_rect,5)
-					# 	target_pos = offset_rect.center + PLAYER_TOOL_OFFSET[player.status.split('_')[0]]
-					# 	pygame.draw.circle(self.display_surface,'blue',target_pos,5)
\ No newline at end of file
+		self.offset.x = player.rect.centerx - self.half_width
+		self.offset.y = player.rect.centery - self.half_height
+		camera_rect = pygame.Rect((int(self.offset.x), int(self.offset.y)), self.view_size)
+
+		self.flush_pending()
+		for layer, bucket in list(self.layers.items()):
+			for sprite in self.visible_sprites(layer, bucket, camera_rect):
+				offset_rect = sprite.rect.copy()
+				offset_rect.center -= self.offset
+				self.display_surface.blit(sprite.image, offset_rect)
+
+				# # anaytics
+				# if sprite == player:
+				# 	pygame.draw.rect(self.display_surface,'red',offset_rect,5)
+				# 	hitbox_rect = player.hitbox.copy()
+				# 	hitbox_rect.center = offset_rect.center
+				# 	pygame.draw.rect(self.display_surface,'green',hitbox_rect,5)
+				# 	target_pos = offset_rect.center + PLAYER_TOOL_OFFSET[player.status.split('_')[0]]
+				# 	pygame.draw.circle(self.display_surface,'blue',target_pos,5)
+
+			for draw in self.layer_drawers.get(layer, ()):
+				draw(self.display_surface, self.offset, camera_rect)
\ No newline at end of file
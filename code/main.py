@@ -1,10 +1,10 @@
 import os
 import pygame, sys
-import importlib
 
 import settings
 from start_menu import StartMenu
 from pause_menu import PauseMenu
+from autosave import Autosave
 import save_system
 
 class Game:
@@ -26,6 +26,8 @@ class Game:
 				settings.MUSIC_VOLUME = float(cfg['music_volume'])
 			if 'sfx_volume' in cfg:
 				settings.SFX_VOLUME = float(cfg['sfx_volume'])
+			if 'fps_cap' in cfg:
+				settings.FPS_CAP = max(0, int(cfg['fps_cap']))
 		except Exception:
 			pass
 
@@ -38,37 +40,25 @@ class Game:
 		self.pause_menu = None
 		self.last_game_frame = None
 		self.current_save_slot = None
+		self.autosave = None
+		# world kept after returning to the start menu, reused by the next slot load
+		self.spare_level = None
+		# menus and the pause screen only redraw when this is set (see run)
+		self.redraw = True
 		self.menu = StartMenu()
 		self.menu.refresh_save_state()
 		self.menu.start_music()
 
-	def _reload_gameplay_modules(self):
-		# Needed because many modules use `from settings import *`.
-		# Reloading re-reads the updated settings (e.g., resolution) before creating a new Level.
-		module_names = [
-			'sprites',
-			'soil',
-			'player',
-			'overlay',
-			'sky',
-			'transition',
-			'menu',
-			'level',
-		]
-		for name in module_names:
-			mod = sys.modules.get(name)
-			if mod is None:
-				continue
-			try:
-				importlib.reload(mod)
-			except Exception:
-				pass
-
 	def apply_resolution(self, width: int, height: int):
-		# IMPORTANT: This must happen before importing Level (which reads settings via star-imports)
 		settings.set_resolution(width, height)
 		self.screen = pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
 		self.menu.set_display_surface()
+		if self.pause_menu:
+			self.pause_menu.set_display_surface()
+		# running worlds only rebuild their screen-sized parts
+		for level in (self.level, self.spare_level):
+			if level is not None:
+				level.resize()
 		try:
 			save_system.save_settings({
 				'resolution': [int(settings.SCREEN_WIDTH), int(settings.SCREEN_HEIGHT)],
@@ -81,14 +71,26 @@ class Game:
 	def start_game(self, saved_level_state=None):
 		# Stop menu music so it doesn't overlap with in-game music
 		self.menu.stop_music()
-		# Lazy import so all star-imports inside the game code see the chosen resolution
 		from level import Level
-		self.level = Level()
-		if saved_level_state is not None:
+		if saved_level_state is not None and self.spare_level is not None:
+			# Reuse the already built world; only its mutable state is replaced.
+			self.level, self.spare_level = self.spare_level, None
 			try:
-				self.level.apply_state(saved_level_state)
+				self.level.load_state(saved_level_state)
 			except Exception:
 				pass
+			# the volume may have changed in the start menu since this level was built
+			self.level.music.set_volume(settings.MUSIC_VOLUME)
+			self.level.music.play(loops = -1)
+		else:
+			self.spare_level = None
+			self.level = Level()
+			if saved_level_state is not None:
+				try:
+					self.level.apply_state(saved_level_state)
+				except Exception:
+					pass
+		self.autosave = Autosave(self.level, self.save_current_game)
 		self.in_menu = False
 		self.paused = False
 		self.last_game_frame = None
@@ -110,14 +112,48 @@ class Game:
 			payload = {
 				'level': self.level.serialize_state(),
 			}
-			save_system.save_game_slot(int(slot), payload)
+			# handed back to the level if the background write fails (see _on_slot_saved)
+			level, parts = self.level, set(self.level.unsaved)
+
+			def on_saved(slot, error):
+				self._on_slot_saved(slot, error, level, parts)
+
+			# encode + write + fsync (and the thumbnail PNG) happen on the save worker thread
+			save_system.save_game_slot_async(int(slot), payload, on_saved, self._thumbnail_writer(int(slot)))
+			# queued: from here on a failure comes back through _on_slot_saved
+			level.unsaved -= parts
 			self.current_save_slot = int(slot)
-			self.menu.refresh_save_state()
-			if self.pause_menu:
-				self.pause_menu.refresh_slots()
 		except Exception:
 			pass
 
+	def _on_slot_saved(self, slot: int, error, level=None, parts=()):
+		# runs on the main thread, from save_system.poll_saves()
+		if error is not None:
+			print(f'Save to slot {slot} failed: {error}', file=sys.stderr)
+			# still unsaved: the next autosave has to write these parts again
+			if level is not None:
+				level.unsaved |= parts
+		self.menu.refresh_save_state()
+		if self.pause_menu:
+			self.pause_menu.refresh_slots()
+
+	def _thumbnail_writer(self, slot: int):
+		# Small preview referenced from the slot index. Scaling copies the frame
+		# here; the returned callable only encodes and writes the PNG.
+		frame = self.last_game_frame if self.last_game_frame is not None else self.screen
+		try:
+			width = 160
+			height = max(1, round(frame.get_height() * width / frame.get_width()))
+			thumbnail = pygame.transform.smoothscale(frame, (width, height))
+		except Exception:
+			return None
+		path = save_system.thumbnail_path(slot)
+
+		def write():
+			os.makedirs(os.path.dirname(path), exist_ok=True)
+			pygame.image.save(thumbnail, path)
+		return write
+
 	def load_game_from_slot(self, slot: int, from_pause: bool):
 		data = save_system.load_game_slot(int(slot)) or {}
 		if not isinstance(data, dict):
@@ -127,6 +163,19 @@ class Game:
 		# Settings are global (stored in savegame/config.json) and should not
 		# revert when the player loads a different slot.
 
+		level_state = data.get('level') if isinstance(data, dict) else None
+		self.current_save_slot = int(slot)
+
+		# In game: swap the saved state into the running level (map, assets and music stay).
+		if from_pause and self.level is not None and isinstance(level_state, dict):
+			try:
+				self.level.load_state(level_state)
+			except Exception:
+				pass
+			self.autosave = Autosave(self.level, self.save_current_game)
+			self.last_game_frame = None
+			return
+
 		# Stop current gameplay music if any
 		if from_pause:
 			try:
@@ -135,15 +184,17 @@ class Game:
 			except Exception:
 				pass
 
-		# Reload gameplay modules so star-import settings are refreshed
-		self._reload_gameplay_modules()
-		self.current_save_slot = int(slot)
-		self.start_game(saved_level_state=(data.get('level') if isinstance(data, dict) else None))
+		self.start_game(saved_level_state=level_state)
 
 	def enter_pause(self):
 		if self.in_menu or self.level is None:
 			return
 		self.paused = True
+		# the screen still shows the last game frame; keep it as the pause background
+		try:
+			self.last_game_frame = self.screen.copy()
+		except Exception:
+			self.last_game_frame = None
 		if self.pause_menu is None:
 			self.pause_menu = PauseMenu()
 		else:
@@ -155,6 +206,7 @@ class Game:
 
 	def resume_from_pause(self):
 		self.paused = False
+		self.last_game_frame = None
 		try:
 			pygame.mixer.unpause()
 		except:
@@ -171,7 +223,9 @@ class Game:
 				self.level.music.stop()
 		except:
 			pass
+		self.spare_level = self.level
 		self.level = None
+		self.autosave = None
 		self.paused = False
 		self.in_menu = True
 		self.last_game_frame = None
@@ -183,13 +237,27 @@ class Game:
 			pass
 		self.menu.start_music(force=True)
 
+	def tick(self):
+		"""Wait for the next frame and return its dt in seconds."""
+		fps = settings.FPS_CAP
+		if self.in_menu or self.paused:
+			fps = min(fps, settings.IDLE_FPS) if fps else settings.IDLE_FPS
+		dt = self.clock.tick(fps) / 1000
+		# a stall (window drag, slow disk) must not become one huge simulation step
+		return min(dt, settings.MAX_FRAME_DT)
+
 	def run(self):
 		while True:
-			for event in pygame.event.get():
+			events = pygame.event.get()
+			if events:
+				self.redraw = True
+			for event in events:
 				if event.type == pygame.QUIT:
 					# Best-effort save if player closes the window mid-game (only if a slot is selected)
 					if not self.in_menu:
 						self.save_current_game()
+					# make sure queued background saves reach the disk
+					save_system.flush_saves()
 					self.menu.stop_music()
 					pygame.quit()
 					sys.exit()
@@ -224,6 +292,7 @@ class Game:
 							})
 						except Exception:
 							pass
+						save_system.flush_saves()
 						self.menu.stop_music()
 						pygame.quit()
 						sys.exit()
@@ -239,24 +308,13 @@ class Game:
 							self.return_to_menu()
 						elif isinstance(action, tuple) and action[0] == 'resolution':
 							w, h = action[1]
-							# Resolution changes require a Level rebuild because many modules
-							# use `from settings import *`.
-							saved_level_state = None
-							try:
-								if self.level is not None:
-									saved_level_state = self.level.serialize_state()
-							except Exception:
-								saved_level_state = None
+							self.apply_resolution(w, h)
+							# redraw the paused world at the new size for the pause background
 							try:
-								if self.level is not None and hasattr(self.level, 'music'):
-									self.level.music.stop()
+								self.level.draw_still()
+								self.last_game_frame = self.screen.copy()
 							except Exception:
-								pass
-							self.apply_resolution(w, h)
-							self._reload_gameplay_modules()
-							self.start_game(saved_level_state=saved_level_state)
-							self.enter_pause()
-							self.last_game_frame = None
+								self.last_game_frame = None
 						elif isinstance(action, tuple) and action[0] == 'music_volume':
 							try:
 								if self.level is not None and hasattr(self.level, 'music'):
@@ -282,28 +340,40 @@ class Game:
 							slot = int(action[1])
 							self.load_game_from_slot(slot, from_pause=True)
 							# Remain unpaused after loading
-							self.paused = False
+							self.resume_from_pause()
 					else:
+						if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+							self.level.profiler.toggle()
+						if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+							try:
+								self.level.profiler.export(os.path.join(save_system._project_root(), 'traces'))
+							except Exception:
+								pass
 						if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
 							# ESC is also used to close the shop menu; don't pause while shop is open
 							if not (self.level and getattr(self.level, 'shop_active', False)):
 								self.enter_pause()
   
-			dt = self.clock.tick() / 1000
-			if self.in_menu:
-				self.menu.draw()
-			elif self.paused:
-				if self.pause_menu:
-					self.pause_menu.set_display_surface()
-				self.screen = pygame.display.get_surface()
-				(self.pause_menu.draw(self.last_game_frame) if self.pause_menu else None)
+			if save_system.poll_saves():
+				# slot labels changed
+				self.redraw = True
+			dt = self.tick()
+			if self.in_menu or self.paused:
+				# nothing animates here; draw only after input or a finished save
+				if not self.redraw:
+					continue
+				self.redraw = False
+				if self.in_menu:
+					self.menu.draw()
+				else:
+					if self.pause_menu:
+						self.pause_menu.set_display_surface()
+					self.screen = pygame.display.get_surface()
+					(self.pause_menu.draw(self.last_game_frame) if self.pause_menu else None)
 			else:
 				self.level.run(dt)
-				# Keep a copy for pause background
-				try:
-					self.last_game_frame = self.screen.copy()
-				except:
-					self.last_game_frame = None
+				self.autosave.update(dt)
+				self.redraw = True
 			pygame.display.update()
 
 if __name__ == '__main__':
@@ -0,0 +1,284 @@
+import os
+import pickle
+import hashlib
+import xml.etree.ElementTree as ElementTree
+
+import pygame
+
+from settings import *
+
+# Compiled maps live next to the source map, e.g. data/cache/map.tmx.bin
+CACHE_DIR_NAME = 'cache'
+CACHE_MAGIC = b'MVMAP'
+CACHE_VERSION = 2
+
+# Non-animated tile layers pre-rendered into MAP_CHUNK_SIZE chunks, keyed by
+# the z-layer they are drawn on. Y-sorted z-layers are baked into strips one
+# tile row high so every strip keeps the centery its tiles had.
+STATIC_LAYERS = {
+	'house bottom': ['HouseFloor', 'HouseFurnitureBottom'],
+	'main': ['HouseWalls', 'HouseFurnitureTop', 'Fence'],
+}
+Y_SORTED_STATIC = {'main'}
+
+# Tile layers whose tiles are obstacles, stored as hitboxes (see Generic.__init__).
+COLLISION_LAYERS = ['Fence', 'Collision']
+
+# process-wide: a map is parsed/loaded at most once per run
+_loaded = {}
+
+
+class MapObject:
+	__slots__ = ('name', 'x', 'y', 'width', 'height', 'image')
+
+	def __init__(self, name, x, y, width, height, image):
+		self.name = name
+		self.x = x
+		self.y = y
+		self.width = width
+		self.height = height
+		self.image = image
+
+
+class MapData:
+	"""Everything `Level` and `SoilLayer` need from map.tmx, without pytmx objects."""
+
+	def __init__(self, artifact):
+		self.width = artifact['width']
+		self.height = artifact['height']
+		self.tile_size = artifact['tile_size']
+
+		images = [_surface_from_record(record) for record in artifact['images']]
+		self.layers = {
+			name: [(x, y, images[index]) for x, y, index in cells]
+			for name, cells in artifact['layers'].items()}
+		self.object_layers = {
+			name: [MapObject(n, x, y, w, h, images[index] if index is not None else None) for n, x, y, w, h, index in objs]
+			for name, objs in artifact['objects'].items()}
+		self.static_layers = {
+			name: [(pos, _surface_from_record(record)) for pos, record in surfaces]
+			for name, surfaces in artifact['static_layers'].items()}
+		self.collision_rects = {
+			name: [pygame.Rect(rect) for rect in rects]
+			for name, rects in artifact['collision_rects'].items()}
+
+	def tiles(self, layer):
+		"""(x, y, surface) for every tile of a tile layer, like pytmx `layer.tiles()`."""
+		return self.layers.get(layer, [])
+
+	def cells(self, layer):
+		return [(x, y) for x, y, _ in self.layers.get(layer, [])]
+
+	def objects(self, layer):
+		return self.object_layers.get(layer, [])
+
+	def static_surfaces(self, name):
+		"""[(topleft, surface)] chunks pre-rendered for one of STATIC_LAYERS."""
+		return self.static_layers.get(name, [])
+
+	def hitboxes(self, layer):
+		return self.collision_rects.get(layer, [])
+
+
+def _surface_to_record(surf):
+	# opaque tiles (no per-pixel alpha) stay opaque; their padding byte is not alpha
+	mode = 'RGBA' if surf.get_flags() & pygame.SRCALPHA else 'RGB'
+	return (surf.get_width(), surf.get_height(), mode, pygame.image.tobytes(surf, mode))
+
+
+def _surface_from_record(record):
+	width, height, mode, data = record
+	surf = pygame.image.frombytes(data, (width, height), mode)
+	return surf.convert_alpha() if mode == 'RGBA' else surf.convert()
+
+
+def _dependencies(tmx_path):
+	"""The .tmx file plus every tileset (.tsx) and image it pulls in."""
+	found = [os.path.abspath(tmx_path)]
+	pending = [os.path.abspath(tmx_path)]
+	while pending:
+		path = pending.pop()
+		try:
+			root = ElementTree.parse(path).getroot()
+		except Exception:
+			continue
+		base = os.path.dirname(path)
+		for element in root.iter():
+			source = element.get('source')
+			if not source or element.tag not in ('tileset', 'image'):
+				continue
+			dep = os.path.normpath(os.path.join(base, source))
+			if dep in found:
+				continue
+			found.append(dep)
+			if dep.endswith('.tsx'):
+				pending.append(dep)
+	return found
+
+
+def _file_hash(path):
+	digest = hashlib.sha1()
+	with open(path, 'rb') as f:
+		for block in iter(lambda: f.read(1 << 16), b''):
+			digest.update(block)
+	return digest.hexdigest()
+
+
+def _fingerprint(paths):
+	prints = []
+	for path in paths:
+		try:
+			stat = os.stat(path)
+			prints.append((path, stat.st_mtime_ns, stat.st_size, _file_hash(path)))
+		except OSError:
+			prints.append((path, None, None, None))
+	return prints
+
+
+def _is_fresh(fingerprint):
+	"""mtime/size match is enough; otherwise fall back to comparing content hashes."""
+	for path, mtime, size, digest in fingerprint:
+		try:
+			stat = os.stat(path)
+		except OSError:
+			if digest is not None:
+				return False
+			continue
+		if stat.st_mtime_ns == mtime and stat.st_size == size:
+			continue
+		if digest is None or _file_hash(path) != digest:
+			return False
+	return True
+
+
+def bake_chunks(placed, chunk_size, rows = False):
+	"""Composite [(rect, surface)] into chunk surfaces, in draw order.
+
+	A tile goes to the chunk holding its topleft; each chunk is cropped to the
+	tiles it got. With `rows` a chunk is only one tile row high.
+	"""
+	chunks = {}
+	for rect, surf in placed:
+		if rows:
+			key = (rect.x // chunk_size, rect.top, rect.bottom)
+		else:
+			key = (rect.x // chunk_size, rect.y // chunk_size)
+		chunks.setdefault(key, []).append((rect, surf))
+
+	baked = []
+	for key in sorted(chunks, key = lambda key: (key[1], key[0])):
+		tiles = chunks[key]
+		bounds = tiles[0][0].unionall([rect for rect, _ in tiles])
+		composite = pygame.Surface(bounds.size, pygame.SRCALPHA)
+		for rect, surf in tiles:
+			composite.blit(surf, rect.move(-bounds.x, -bounds.y))
+		baked.append((bounds.topleft, composite))
+	return baked
+
+
+def compile_map(tmx_path):
+	"""Parse a .tmx with pytmx and flatten it into a picklable artifact."""
+	from pytmx.util_pygame import load_pygame
+
+	tmx_data = load_pygame(tmx_path)
+	tile_size = tmx_data.tilewidth
+
+	images = []
+	image_index = {}
+
+	def add_image(surf):
+		key = id(surf)
+		if key not in image_index:
+			image_index[key] = len(images)
+			images.append(_surface_to_record(surf))
+		return image_index[key]
+
+	layers = {}
+	objects = {}
+	for layer in tmx_data.layers:
+		if hasattr(layer, 'tiles'):
+			layers[layer.name] = [(x, y, add_image(surf)) for x, y, surf in layer.tiles()]
+		elif hasattr(layer, '__iter__'):
+			objects[layer.name] = [
+				(obj.name, obj.x, obj.y, obj.width, obj.height, add_image(obj.image) if obj.image else None)
+				for obj in layer]
+
+	static_layers = {}
+	for name, layer_names in STATIC_LAYERS.items():
+		placed = [
+			(pygame.Rect(x * tile_size, y * tile_size, surf.get_width(), surf.get_height()), surf)
+			for layer_name in layer_names
+			for x, y, surf in tmx_data.get_layer_by_name(layer_name).tiles()]
+		chunks = bake_chunks(placed, MAP_CHUNK_SIZE, rows = name in Y_SORTED_STATIC)
+		static_layers[name] = [(pos, _surface_to_record(surf)) for pos, surf in chunks]
+
+	collision_rects = {}
+	for layer_name in COLLISION_LAYERS:
+		rects = collision_rects[layer_name] = []
+		for x, y, surf in tmx_data.get_layer_by_name(layer_name).tiles():
+			rect = surf.get_rect(topleft = (x * tile_size, y * tile_size))
+			hitbox = rect.inflate(-rect.width * 0.2, -rect.height * 0.75)
+			rects.append(tuple(hitbox))
+
+	return {
+		'width': tmx_data.width,
+		'height': tmx_data.height,
+		'tile_size': tile_size,
+		'images': images,
+		'layers': layers,
+		'objects': objects,
+		'static_layers': static_layers,
+		'collision_rects': collision_rects,
+	}
+
+
+def cache_path(tmx_path):
+	directory = os.path.join(os.path.dirname(os.path.abspath(tmx_path)), CACHE_DIR_NAME)
+	return os.path.join(directory, os.path.basename(tmx_path) + '.bin')
+
+
+def _read_cache(path):
+	try:
+		with open(path, 'rb') as f:
+			if f.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+				return None
+			payload = pickle.load(f)
+	except Exception:
+		return None
+	if not isinstance(payload, dict) or payload.get('version') != CACHE_VERSION:
+		return None
+	if not _is_fresh(payload.get('fingerprint', [])):
+		return None
+	return payload.get('artifact')
+
+
+def _write_cache(path, artifact, fingerprint):
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	tmp_path = path + '.tmp'
+	with open(tmp_path, 'wb') as f:
+		f.write(CACHE_MAGIC)
+		pickle.dump({'version': CACHE_VERSION, 'fingerprint': fingerprint, 'artifact': artifact}, f, protocol=pickle.HIGHEST_PROTOCOL)
+	os.replace(tmp_path, path)
+
+
+def load_map(tmx_path, use_cache = True):
+	"""Return MapData for `tmx_path`, compiling and caching it if needed."""
+	key = os.path.abspath(tmx_path)
+	if key in _loaded:
+		return _loaded[key]
+
+	path = cache_path(tmx_path)
+	artifact = _read_cache(path) if use_cache else None
+	if artifact is None:
+		fingerprint = _fingerprint(_dependencies(tmx_path))
+		artifact = compile_map(tmx_path)
+		if use_cache:
+			try:
+				_write_cache(path, artifact, fingerprint)
+			except Exception:
+				# A read-only install still works, it just recompiles every run.
+				pass
+
+	map_data = MapData(artifact)
+	_loaded[key] = map_data
+	return map_data
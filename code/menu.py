@@ -1,6 +1,8 @@
 import pygame
+import settings
 from settings import *
 from timer import Timer
+from support import render_text
 
 class Menu:
 	def __init__(self, player, toggle_menu):
@@ -8,7 +10,6 @@ class Menu:
 		# general setup
 		self.player = player
 		self.toggle_menu = toggle_menu
-		self.display_surface = pygame.display.get_surface()
 		self.font = pygame.font.Font('../font/LycheeSoda.ttf', 30)
 
 		# options
@@ -24,10 +25,11 @@ class Menu:
 		# movement
 		self.index = 0
 		self.timer = Timer(200)
+		self.input_source = pygame.key.get_pressed
 
 	def display_money(self):
-		text_surf = self.font.render(f'${self.player.money}', False, 'Black')
-		text_rect = text_surf.get_rect(midbottom = (SCREEN_WIDTH / 2,SCREEN_HEIGHT - 20))
+		text_surf = render_text(self.font, f'${self.player.money}', False, 'Black')
+		text_rect = text_surf.get_rect(midbottom = self.money_pos)
 
 		pygame.draw.rect(self.display_surface,'White',text_rect.inflate(10,10),0,4)
 		self.display_surface.blit(text_surf,text_rect)
@@ -44,15 +46,21 @@ class Menu:
 			self.total_height += text_surf.get_height() + (self.padding * 2)
 
 		self.total_height += (len(self.text_surfs) - 1) * self.space
-		self.menu_top = SCREEN_HEIGHT / 2 - self.total_height / 2
-		self.main_rect = pygame.Rect(SCREEN_WIDTH / 2 - self.width / 2,self.menu_top,self.width,self.total_height)
+		self.resize()
 
 		# buy / sell text surface
 		self.buy_text = self.font.render('buy',False,'Black')
 		self.sell_text =  self.font.render('sell',False,'Black')
 
+	def resize(self):
+		# screen-size dependent layout; the text surfaces stay as they are
+		self.display_surface = pygame.display.get_surface()
+		self.menu_top = settings.SCREEN_HEIGHT / 2 - self.total_height / 2
+		self.main_rect = pygame.Rect(settings.SCREEN_WIDTH / 2 - self.width / 2,self.menu_top,self.width,self.total_height)
+		self.money_pos = (settings.SCREEN_WIDTH / 2,settings.SCREEN_HEIGHT - 20)
+
 	def input(self):
-		keys = pygame.key.get_pressed()
+		keys = self.input_source()
 		self.timer.update()
 
 		if keys[pygame.K_ESCAPE]:
@@ -78,6 +86,7 @@ class Menu:
 					if self.player.item_inventory[current_item] > 0:
 						self.player.item_inventory[current_item] -= 1
 						self.player.money += SALE_PRICES[current_item]
+						self.player.mark_dirty('inventory')
 
 				# buy
 				else:
@@ -85,6 +94,7 @@ class Menu:
 					if self.player.money >= seed_price:
 						self.player.seed_inventory[current_item] += 1
 						self.player.money -= PURCHASE_PRICES[current_item]
+						self.player.mark_dirty('inventory')
 
 		# clamo the values
 		if self.index < 0:
@@ -103,7 +113,7 @@ class Menu:
 		self.display_surface.blit(text_surf, text_rect)
 
 		# amount
-		amount_surf = self.font.render(str(amount), False, 'Black')
+		amount_surf = render_text(self.font, str(amount), False, 'Black')
 		amount_rect = amount_surf.get_rect(midright = (self.main_rect.right - 20,bg_rect.centery))
 		self.display_surface.blit(amount_surf, amount_rect)
 
@@ -117,12 +127,11 @@ class Menu:
 				pos_rect = self.buy_text.get_rect(midleft = (self.main_rect.left + 150,bg_rect.centery))
 				self.display_surface.blit(self.buy_text,pos_rect)
 
-	def update(self):
-		self.input()
+	def display(self):
 		self.display_money()
 
+		amount_list = list(self.player.item_inventory.values()) + list(self.player.seed_inventory.values())
 		for text_index, text_surf in enumerate(self.text_surfs):
 			top = self.main_rect.top + text_index * (text_surf.get_height() + (self.padding * 2) + self.space)
-			amount_list = list(self.player.item_inventory.values()) + list(self.player.seed_inventory.values())
 			amount = amount_list[text_index]
 			self.show_entry(text_surf, amount, top, self.index == text_index)
\ No newline at end of file
@@ -1,26 +1,32 @@
 import pygame
+import settings
 from settings import *
+from support import load_image
 
 class Overlay:
 	def __init__(self,player):
 
 		# general setup
-		self.display_surface = pygame.display.get_surface()
 		self.player = player
+		self.resize()
 
 		# imports 
 		overlay_path = '../graphics/overlay/'
-		self.tools_surf = {tool: pygame.image.load(f'{overlay_path}{tool}.png').convert_alpha() for tool in player.tools}
-		self.seeds_surf = {seed: pygame.image.load(f'{overlay_path}{seed}.png').convert_alpha() for seed in player.seeds}
+		self.tools_surf = {tool: load_image(f'{overlay_path}{tool}.png') for tool in player.tools}
+		self.seeds_surf = {seed: load_image(f'{overlay_path}{seed}.png') for seed in player.seeds}
+
+	def resize(self):
+		self.display_surface = pygame.display.get_surface()
+		self.positions = dict(settings.OVERLAY_POSITIONS)
 
 	def display(self):
 
 		# tool
 		tool_surf = self.tools_surf[self.player.selected_tool]
-		tool_rect = tool_surf.get_rect(midbottom = OVERLAY_POSITIONS['tool'])
+		tool_rect = tool_surf.get_rect(midbottom = self.positions['tool'])
 		self.display_surface.blit(tool_surf,tool_rect)
 
 		# seeds
 		seed_surf = self.seeds_surf[self.player.selected_seed]
-		seed_rect = seed_surf.get_rect(midbottom = OVERLAY_POSITIONS['seed'])
+		seed_rect = seed_surf.get_rect(midbottom = self.positions['seed'])
 		self.display_surface.blit(seed_surf,seed_rect)
\ No newline at end of file
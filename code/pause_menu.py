@@ -4,6 +4,7 @@ import pygame
 
 import settings
 import save_system
+from support import render_text
 
 
 class PauseMenu:
@@ -13,12 +14,14 @@ class PauseMenu:
 		self.font = pygame.font.Font(self._abs('../font/LycheeSoda.ttf'), 34)
 		self.page = 'main'  # 'main' | 'settings' | 'save' | 'load' | 'confirm_save' | 'confirm_delete'
 		self.main_options = ['Lanjutkan', 'Save Game', 'Load Game', 'Pengaturan', 'Kembali ke Menu']
-		self.settings_options = ['Resolusi', 'Volume Music', 'Volume SFX', 'Kembali']
+		self.settings_options = ['Resolusi', 'Volume Music', 'Volume SFX', 'FPS', 'Kembali']
 		self.slot_options = []
 		self.confirm_options = ['Ya', 'Tidak']
 		self._confirm_slot = None
 		self.index = 0
 		self.spacing = 52
+		# translucent backdrop, rebuilt only when the window size changes
+		self._dim = None
 
 		# resolution selector (for settings page)
 		self.resolutions = list(settings.AVAILABLE_RESOLUTIONS)
@@ -27,7 +30,7 @@ class PauseMenu:
 		self.refresh_slots()
 
 	def refresh_slots(self):
-		self.slot_options = [save_system.format_slot_label(i) for i in save_system.list_slots()] + ['Kembali']
+		self.slot_options = save_system.format_slot_labels() + ['Kembali']
 		self.index = max(0, min(self.index, len(self._current_options()) - 1))
 
 	def _current_options(self):
@@ -165,6 +168,15 @@ class PauseMenu:
 					pass
 				return None
 
+			# FPS cap
+			if current_opt == 'FPS' and event.key in (pygame.K_a, pygame.K_LEFT):
+				self._step_fps(-1)
+				return None
+
+			if current_opt == 'FPS' and event.key in (pygame.K_d, pygame.K_RIGHT):
+				self._step_fps(1)
+				return None
+
 		if event.key in (pygame.K_w, pygame.K_UP):
 			self.index = (self.index - 1) % len(options)
 			return None
@@ -238,6 +250,9 @@ class PauseMenu:
 						except Exception:
 							pass
 						return None
+					if current_opt == 'FPS':
+						self._step_fps(1)
+						return None
 				if self.page in ('save', 'load'):
 					if current_opt == 'Kembali':
 						self.go_main()
@@ -287,6 +302,20 @@ class PauseMenu:
 	def _sfx_label(self):
 		return f'Volume SFX: {self._pct(settings.SFX_VOLUME)}%'
 
+	@staticmethod
+	def _fps_label():
+		return f'FPS: {settings.FPS_CAP}' if settings.FPS_CAP else 'FPS: Tanpa batas'
+
+	@staticmethod
+	def _step_fps(step: int):
+		options = list(settings.FPS_OPTIONS)
+		index = options.index(settings.FPS_CAP) if settings.FPS_CAP in options else 0
+		settings.FPS_CAP = options[(index + step) % len(options)]
+		try:
+			save_system.save_settings({'fps_cap': int(settings.FPS_CAP)})
+		except Exception:
+			pass
+
 	def draw(self, background_surf: pygame.Surface | None = None):
 		if background_surf is not None:
 			self.display_surface.blit(background_surf, (0, 0))
@@ -294,12 +323,13 @@ class PauseMenu:
 			self.display_surface.fill('black')
 
 		w, h = self.display_surface.get_size()
-		overlay = pygame.Surface((w, h), flags=pygame.SRCALPHA)
-		overlay.fill((0, 0, 0, 160))
-		self.display_surface.blit(overlay, (0, 0))
+		if self._dim is None or self._dim.get_size() != (w, h):
+			self._dim = pygame.Surface((w, h), flags=pygame.SRCALPHA)
+			self._dim.fill((0, 0, 0, 160))
+		self.display_surface.blit(self._dim, (0, 0))
 
 		title = 'PAUSE' if self.page != 'settings' else 'PENGATURAN'
-		title_surf = self.title_font.render(title, True, 'White')
+		title_surf = render_text(self.title_font, title, True, 'White')
 		title_rect = title_surf.get_rect(center=(w // 2, 150))
 		self.display_surface.blit(title_surf, title_rect)
 
@@ -311,7 +341,7 @@ class PauseMenu:
 			hint_text = 'ESC kembali | DEL hapus slot'
 		else:
 			hint_text = 'ESC kembali'
-		hint_surf = self.font.render(hint_text, True, 'White')
+		hint_surf = render_text(self.font, hint_text, True, 'White')
 		hint_rect = hint_surf.get_rect(center=(w // 2, 220))
 		self.display_surface.blit(hint_surf, hint_rect)
 
@@ -319,13 +349,13 @@ class PauseMenu:
 		options = self._current_options()
 		if self.page == 'confirm_save' and self._confirm_slot is not None:
 			msg = f'Timpa Slot {int(self._confirm_slot)}?'
-			msg_surf = self.font.render(msg, True, 'White')
+			msg_surf = render_text(self.font, msg, True, 'White')
 			msg_rect = msg_surf.get_rect(center=(w // 2, 280))
 			self.display_surface.blit(msg_surf, msg_rect)
 			start_y = 340
 		if self.page == 'confirm_delete' and self._confirm_slot is not None:
 			msg = f'Hapus Slot {int(self._confirm_slot)}?'
-			msg_surf = self.font.render(msg, True, 'White')
+			msg_surf = render_text(self.font, msg, True, 'White')
 			msg_rect = msg_surf.get_rect(center=(w // 2, 280))
 			self.display_surface.blit(msg_surf, msg_rect)
 			start_y = 340
@@ -337,11 +367,13 @@ class PauseMenu:
 					label = self._music_label()
 				elif opt == 'Volume SFX':
 					label = self._sfx_label()
+				elif opt == 'FPS':
+					label = self._fps_label()
 				else:
 					label = opt
 			else:
 				label = opt
 			color = '#FFEB3B' if i == self.index else 'White'
-			surf = self.font.render(label, True, color)
+			surf = render_text(self.font, label, True, color)
 			rect = surf.get_rect(center=(w // 2, start_y + i * self.spacing))
 			self.display_surface.blit(surf, rect)
@@ -1,10 +1,11 @@
 import pygame
+import settings
 from settings import *
 from support import *
 from timer import Timer
 
 class Player(pygame.sprite.Sprite):
-	def __init__(self, pos, group, collision_sprites, tree_sprites, interaction, soil_layer, toggle_shop):
+	def __init__(self, pos, group, collision_sprites, tree_sprites, interaction, soil_layer, toggle_shop, mark_dirty = None):
 		super().__init__(group)
 
 		self.import_assets()
@@ -55,6 +56,7 @@ class Player(pygame.sprite.Sprite):
 		'tomato': 5
 		}
 		self.money = 200
+		self.mark_dirty = mark_dirty or ignore_dirty
 
 		# interaction
 		self.tree_sprites = tree_sprites
@@ -64,8 +66,11 @@ class Player(pygame.sprite.Sprite):
 		self.toggle_shop = toggle_shop
 
 		# sound
-		self.watering = pygame.mixer.Sound('../audio/water.mp3')
-		self.watering.set_volume(SFX_VOLUME)
+		self.watering = load_sound('../audio/water.mp3')
+		self.watering.set_volume(settings.SFX_VOLUME)
+
+		# keyboard state source; headless runs inject scripted input here
+		self.input_source = pygame.key.get_pressed
 
 	def use_tool(self):
 		if self.selected_tool == 'hoe':
@@ -79,7 +84,7 @@ class Player(pygame.sprite.Sprite):
 		if self.selected_tool == 'water':
 			self.soil_layer.water(self.target_pos)
 			try:
-				self.watering.set_volume(SFX_VOLUME)
+				self.watering.set_volume(settings.SFX_VOLUME)
 			except Exception:
 				pass
 			self.watering.play()
@@ -92,6 +97,7 @@ class Player(pygame.sprite.Sprite):
 		if self.seed_inventory[self.selected_seed] > 0:
 			self.soil_layer.plant_seed(self.target_pos, self.selected_seed)
 			self.seed_inventory[self.selected_seed] -= 1
+			self.mark_dirty('inventory')
 
 	def import_assets(self):
 		self.animations = {'up': [],'down': [],'left': [],'right': [],
@@ -112,7 +118,7 @@ class Player(pygame.sprite.Sprite):
 		self.image = self.animations[self.status][int(self.frame_index)]
 
 	def input(self):
-		keys = pygame.key.get_pressed()
+		keys = self.input_source()
 
 		if not self.timers['tool use'].active and not self.sleep:
 			# directions 
@@ -184,24 +190,23 @@ class Player(pygame.sprite.Sprite):
 			timer.update()
 
 	def collision(self, direction):
-		for sprite in self.collision_sprites.sprites():
-			if hasattr(sprite, 'hitbox'):
-				if sprite.hitbox.colliderect(self.hitbox):
-					if direction == 'horizontal':
-						if self.direction.x > 0: # moving right
-							self.hitbox.right = sprite.hitbox.left
-						if self.direction.x < 0: # moving left
-							self.hitbox.left = sprite.hitbox.right
-						self.rect.centerx = self.hitbox.centerx
-						self.pos.x = self.hitbox.centerx
-
-					if direction == 'vertical':
-						if self.direction.y > 0: # moving down
-							self.hitbox.bottom = sprite.hitbox.top
-						if self.direction.y < 0: # moving up
-							self.hitbox.top = sprite.hitbox.bottom
-						self.rect.centery = self.hitbox.centery
-						self.pos.y = self.hitbox.centery
+		for sprite in self.collision_sprites.nearby(self.hitbox):
+			if sprite.hitbox.colliderect(self.hitbox):
+				if direction == 'horizontal':
+					if self.direction.x > 0: # moving right
+						self.hitbox.right = sprite.hitbox.left
+					if self.direction.x < 0: # moving left
+						self.hitbox.left = sprite.hitbox.right
+					self.rect.centerx = self.hitbox.centerx
+					self.pos.x = self.hitbox.centerx
+
+				if direction == 'vertical':
+					if self.direction.y > 0: # moving down
+						self.hitbox.bottom = sprite.hitbox.top
+					if self.direction.y < 0: # moving up
+						self.hitbox.top = sprite.hitbox.bottom
+					self.rect.centery = self.hitbox.centery
+					self.pos.y = self.hitbox.centery
 
 	def move(self,dt):
 
@@ -0,0 +1,147 @@
+import os
+import csv
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pygame
+
+from settings import *
+
+PHASES = ['draw', 'update', 'plant_collision', 'menu', 'overlay', 'rain', 'sky', 'transition']
+
+
+class Profiler:
+	"""Opt-in per-phase timings and sprite counts for `Level.run`.
+
+	Disabled by default; `section()` is then a no-op so the game loop pays
+	almost nothing for the instrumentation.
+	"""
+
+	def __init__(self, enabled: bool = False, history: int = 600):
+		self.enabled = enabled
+		self.frames = deque(maxlen=history)
+		self.frame_index = 0
+		self.current = None
+		self.font = None
+
+	def toggle(self) -> bool:
+		self.enabled = not self.enabled
+		if not self.enabled:
+			self.current = None
+		return self.enabled
+
+	def begin_frame(self, dt: float) -> None:
+		if not self.enabled:
+			return
+		self.frame_index += 1
+		self.current = {
+			'frame': self.frame_index,
+			'dt_ms': dt * 1000,
+			'phases': {},
+			'counts': {},
+			'_start': time.perf_counter(),
+		}
+
+	def end_frame(self) -> None:
+		if self.current is None:
+			return
+		frame = self.current
+		frame['total_ms'] = (time.perf_counter() - frame.pop('_start')) * 1000
+		self.frames.append(frame)
+		self.current = None
+
+	@contextmanager
+	def section(self, name: str):
+		if self.current is None:
+			yield
+			return
+		start = time.perf_counter()
+		try:
+			yield
+		finally:
+			phases = self.current['phases'] if self.current is not None else {}
+			phases[name] = phases.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+	def count(self, name: str, value: int) -> None:
+		if self.current is not None:
+			self.current['counts'][name] = int(value)
+
+	def count_sprites(self, groups, camera_group=None) -> None:
+		"""Record `len()` of each named group and, if given, of each camera z-layer."""
+		if self.current is None:
+			return
+		for name, group in groups.items():
+			self.count(name, len(group))
+		if camera_group is not None:
+			# by each sprite's current z: the camera buckets are only brought up
+			# to date while drawing, so they lag behind in headless runs
+			layers = dict.fromkeys(camera_group.layers, 0)
+			for sprite in camera_group:
+				layers[sprite.z] = layers.get(sprite.z, 0) + 1
+			layer_names = {z: name for name, z in LAYERS.items()}
+			for z in sorted(layers):
+				self.count(f'layer:{layer_names.get(z, z)}', layers[z])
+
+	def summary(self):
+		"""Average ms per phase (and total) over the recorded history."""
+		if not self.frames:
+			return {}
+		totals = {}
+		for frame in self.frames:
+			for name, ms in frame['phases'].items():
+				totals[name] = totals.get(name, 0.0) + ms
+			totals['total'] = totals.get('total', 0.0) + frame['total_ms']
+		return {name: ms / len(self.frames) for name, ms in totals.items()}
+
+	def export_json(self, path: str) -> None:
+		os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+		with open(path, 'w', encoding='utf-8') as f:
+			json.dump({'summary': self.summary(), 'frames': list(self.frames)}, f, indent=1)
+
+	def export_csv(self, path: str) -> None:
+		os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+		count_names = []
+		for frame in self.frames:
+			for name in frame['counts']:
+				if name not in count_names:
+					count_names.append(name)
+		with open(path, 'w', encoding='utf-8', newline='') as f:
+			writer = csv.writer(f)
+			writer.writerow(['frame', 'dt_ms', 'total_ms'] + [f'{p}_ms' for p in PHASES] + count_names)
+			for frame in self.frames:
+				writer.writerow(
+					[frame['frame'], round(frame['dt_ms'], 3), round(frame['total_ms'], 3)]
+					+ [round(frame['phases'].get(p, 0.0), 3) for p in PHASES]
+					+ [frame['counts'].get(name, '') for name in count_names])
+
+	def export(self, directory: str) -> str:
+		"""Write `<directory>/trace_<timestamp>.json` and `.csv`; returns the path stem."""
+		stem = os.path.join(directory, time.strftime('trace_%Y%m%d_%H%M%S'))
+		self.export_json(stem + '.json')
+		self.export_csv(stem + '.csv')
+		return stem
+
+	def draw_overlay(self, surface) -> None:
+		if not self.enabled or not self.frames:
+			return
+		if self.font is None:
+			self.font = pygame.font.Font('../font/LycheeSoda.ttf', 20)
+
+		last = self.frames[-1]
+		avg = self.summary()
+		lines = [f'frame {last["total_ms"]:.2f} ms (avg {avg.get("total", 0.0):.2f})  dt {last["dt_ms"]:.1f} ms']
+		for name in PHASES:
+			if name in avg:
+				lines.append(f'{name}: {last["phases"].get(name, 0.0):.2f} ms (avg {avg[name]:.2f})')
+		for name, value in last['counts'].items():
+			if not name.startswith('layer:'):
+				lines.append(f'{name}: {value}')
+
+		line_height = self.font.get_linesize()
+		panel = pygame.Surface((340, line_height * len(lines) + 10), pygame.SRCALPHA)
+		panel.fill((0, 0, 0, 150))
+		for index, line in enumerate(lines):
+			panel.blit(self.font.render(line, False, 'White'), (6, 5 + index * line_height))
+		surface.blit(panel, (10, 10))
@@ -1,18 +1,39 @@
 import json
 import os
+import struct
+import threading
 import time
+import zlib
 from typing import Any, Dict, Optional
 
 
-SAVE_VERSION = 1
+# Version 2 is the binary slot format (see `encode_save`); version 1 is the
+# original pretty-printed JSON, still read from older slots and `savegame.json`.
+SAVE_VERSION = 2
+SAVE_VERSION_JSON = 1
 SAVE_FILENAME = 'savegame.json'
 
 SLOT_COUNT = 5
-SLOT_TEMPLATE = 'save_slot_{slot}.json'
+SLOT_TEMPLATE = 'save_slot_{slot}.sav'
+SLOT_TEMPLATE_JSON = 'save_slot_{slot}.json'
+THUMBNAIL_TEMPLATE = 'save_slot_{slot}.png'
+
+# Small summary of every slot, so slot lists don't have to open the saves.
+INDEX_VERSION = 1
+INDEX_FILENAME = 'slots_index.json'
+
+# zlib-compress the body of binary saves (the header always stays plain).
+SAVE_COMPRESS = True
 
 CONFIG_VERSION = 1
 CONFIG_FILENAME = 'config.json'
 
+# Optional replacement for `savegame/` (benchmarks and tools point this at a temp dir).
+_save_dir_override: Optional[str] = None
+
+# Serialises slot/index writes between the game thread and the save worker.
+_slot_lock = threading.RLock()
+
 
 def _project_root() -> str:
 	"""Return project root (folder containing `code/`)."""
@@ -21,9 +42,17 @@ def _project_root() -> str:
 
 def _save_dir() -> str:
 	"""Directory where all saves/config are stored."""
+	if _save_dir_override:
+		return _save_dir_override
 	return os.path.join(_project_root(), 'savegame')
 
 
+def set_save_dir(path: Optional[str] = None) -> None:
+	"""Redirect saves/config to `path`; `None` restores the default `savegame/`."""
+	global _save_dir_override
+	_save_dir_override = os.path.abspath(path) if path else None
+
+
 def _ensure_save_dir() -> None:
 	try:
 		os.makedirs(_save_dir(), exist_ok=True)
@@ -109,7 +138,7 @@ def migrate_legacy_saves() -> Dict[str, Any]:
 	# slot saves
 	for slot in list_slots():
 		src = _legacy_slot_path(slot)
-		dst = _slot_path(slot)
+		dst = _json_slot_path(slot)
 		if os.path.exists(src):
 			if _safe_migrate_file(src, dst):
 				results['migrated'].append({'from': src, 'to': dst})
@@ -135,10 +164,33 @@ def _slot_path(slot: int) -> str:
 	return os.path.join(_save_dir(), SLOT_TEMPLATE.format(slot=s))
 
 
+def _json_slot_path(slot: int) -> str:
+	# Version-1 slot in the save dir (written before the binary format).
+	s = int(slot)
+	return os.path.join(_save_dir(), SLOT_TEMPLATE_JSON.format(slot=s))
+
+
 def _legacy_slot_path(slot: int) -> str:
 	base_dir = os.path.dirname(os.path.abspath(__file__))
 	s = int(slot)
-	return os.path.join(base_dir, SLOT_TEMPLATE.format(slot=s))
+	return os.path.join(base_dir, SLOT_TEMPLATE_JSON.format(slot=s))
+
+
+def _existing_slot_path(slot: int) -> Optional[str]:
+	"""Newest existing file for `slot`: binary, then v1 JSON, then legacy `code/`."""
+	for path in (_slot_path(slot), _json_slot_path(slot), _legacy_slot_path(slot)):
+		if os.path.exists(path):
+			return path
+	return None
+
+
+def thumbnail_path(slot: int) -> str:
+	s = int(slot)
+	return os.path.join(_save_dir(), THUMBNAIL_TEMPLATE.format(slot=s))
+
+
+def _index_path() -> str:
+	return os.path.join(_save_dir(), INDEX_FILENAME)
 
 
 def _config_path() -> str:
@@ -155,11 +207,8 @@ def save_exists() -> bool:
 
 
 def slot_exists(slot: int) -> bool:
-	# New location
-	if os.path.exists(_slot_path(slot)):
-		return True
-	# Legacy location
-	if os.path.exists(_legacy_slot_path(slot)):
+	# New location (binary or v1 JSON) / legacy location
+	if _existing_slot_path(slot) is not None:
 		return True
 	# Legacy single save is treated as slot 1 if slot1 doesn't exist
 	return int(slot) == 1 and os.path.exists(_legacy_save_path())
@@ -182,11 +231,15 @@ def delete_save() -> None:
 
 
 def delete_slot(slot: int) -> None:
-	for p in (_slot_path(slot), _legacy_slot_path(slot)):
-		try:
-			os.remove(p)
-		except FileNotFoundError:
-			pass
+	# a queued background save must not bring the slot back afterwards
+	flush_saves()
+	with _slot_lock:
+		for p in (_slot_path(slot), _json_slot_path(slot), _legacy_slot_path(slot), thumbnail_path(slot)):
+			try:
+				os.remove(p)
+			except FileNotFoundError:
+				pass
+		_update_index(slot, None)
 
 
 def delete_config() -> None:
@@ -198,18 +251,296 @@ def delete_config() -> None:
 
 
 def _atomic_write_text(path: str, text: str) -> None:
+	_atomic_write_bytes(path, text.encode('utf-8'))
+
+
+def _atomic_write_bytes(path: str, data: bytes) -> None:
 	tmp_path = path + '.tmp'
-	with open(tmp_path, 'w', encoding='utf-8') as f:
-		f.write(text)
+	with open(tmp_path, 'wb') as f:
+		f.write(data)
 		f.flush()
 		os.fsync(f.fileno())
 	os.replace(tmp_path, path)
 
 
+# --- binary save format (version 2) -------------------------------------
+#
+# header: MAGIC, version (u8), flags (u8), timestamp (u64)   -- never compressed
+# body:   u32 length + compact JSON of everything not packed below,
+#         u8 section count, then per section: u8 id, u32 length, payload
+#
+# Packed sections replace the bulky parts of `Level.serialize_state()`:
+# the soil grid (run-length encoded flag bitmasks) and the plant and tree
+# lists (fixed-size records). Anything with an unexpected shape simply stays
+# in the JSON part, so the format never loses data.
+
+SAVE_MAGIC = b'MVSV'
+_HEADER = struct.Struct('<4sBBQ')
+_FLAG_ZLIB = 1
+
+_SECTION_GRID = 1
+_SECTION_PLANTS = 2
+_SECTION_TREES = 3
+
+_PLANT_RECORD = struct.Struct('<BHHdB')  # type index, grid x, grid y, age, harvestable
+_TREE_RECORD = struct.Struct('<BiiiBH')  # name index, x, y, health, alive, apple count
+_APPLE_RECORD = struct.Struct('<hh')
+
+_PLANT_KEYS = {'type', 'grid', 'age', 'harvestable'}
+_TREE_KEYS = {'name', 'topleft', 'health', 'alive', 'apples'}
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+	while value >= 0x80:
+		out.append((value & 0x7F) | 0x80)
+		value >>= 7
+	out.append(value)
+
+
+def _read_varint(data, pos: int):
+	value = 0
+	shift = 0
+	while True:
+		byte = data[pos]
+		pos += 1
+		value |= (byte & 0x7F) << shift
+		if byte < 0x80:
+			return value, pos
+		shift += 7
+
+
+def _write_strings(out: bytearray, names) -> None:
+	out.append(len(names))
+	for name in names:
+		raw = name.encode('utf-8')
+		out.append(len(raw))
+		out += raw
+
+
+def _read_strings(data, pos: int):
+	count = data[pos]
+	pos += 1
+	names = []
+	for _ in range(count):
+		length = data[pos]
+		names.append(bytes(data[pos + 1:pos + 1 + length]).decode('utf-8'))
+		pos += 1 + length
+	return names, pos
+
+
+def _pack_grid(grid) -> bytes:
+	"""Rows of per-cell flag lists -> width, height, flag names, RLE of bitmasks."""
+	height = len(grid)
+	width = len(grid[0])
+	if height >= 0x10000 or width >= 0x10000 or any(len(row) != width for row in grid):
+		raise ValueError('grid is not a rectangle')
+	names = []
+	masks = bytearray()
+	for row in grid:
+		for cell in row:
+			mask = 0
+			for name in cell:
+				if name not in names:
+					names.append(name)
+				mask |= 1 << names.index(name)
+			if mask > 0xFF:
+				raise ValueError('too many distinct grid flags')
+			masks.append(mask)
+
+	out = bytearray(struct.pack('<HH', width, height))
+	_write_strings(out, names)
+	pos = 0
+	total = len(masks)
+	while pos < total:
+		value = masks[pos]
+		end = pos + 1
+		while end < total and masks[end] == value:
+			end += 1
+		_write_varint(out, end - pos)
+		out.append(value)
+		pos = end
+	return bytes(out)
+
+
+def _unpack_grid(data):
+	width, height = struct.unpack_from('<HH', data, 0)
+	names, pos = _read_strings(data, 4)
+	masks = bytearray()
+	while len(masks) < width * height:
+		run, pos = _read_varint(data, pos)
+		masks += bytes((data[pos],)) * run
+		pos += 1
+	cells = [[name for bit, name in enumerate(names) if mask & (1 << bit)] for mask in range(256)]
+	return [
+		[list(cells[mask]) for mask in masks[y * width:(y + 1) * width]]
+		for y in range(height)]
+
+
+def _pack_plants(plants) -> bytes:
+	if any(not isinstance(plant, dict) or set(plant) != _PLANT_KEYS for plant in plants):
+		raise ValueError('unexpected plant record')
+	types = sorted({str(plant['type']) for plant in plants})
+	out = bytearray()
+	_write_strings(out, types)
+	out += struct.pack('<I', len(plants))
+	for plant in plants:
+		gx, gy = plant['grid']
+		out += _PLANT_RECORD.pack(types.index(str(plant['type'])), int(gx), int(gy), float(plant['age']), bool(plant['harvestable']))
+	return bytes(out)
+
+
+def _unpack_plants(data):
+	types, pos = _read_strings(data, 0)
+	count, = struct.unpack_from('<I', data, pos)
+	pos += 4
+	plants = []
+	for type_index, gx, gy, age, harvestable in _PLANT_RECORD.iter_unpack(data[pos:pos + count * _PLANT_RECORD.size]):
+		plants.append({'type': types[type_index], 'grid': [gx, gy], 'age': age, 'harvestable': bool(harvestable)})
+	return plants
+
+
+def _pack_trees(trees) -> bytes:
+	if any(not isinstance(tree, dict) or set(tree) != _TREE_KEYS for tree in trees):
+		raise ValueError('unexpected tree record')
+	# index 0 stands for a tree without a name
+	names = sorted({str(tree['name']) for tree in trees if tree['name'] is not None})
+	out = bytearray()
+	_write_strings(out, names)
+	out += struct.pack('<I', len(trees))
+	for tree in trees:
+		name_index = 0 if tree['name'] is None else names.index(str(tree['name'])) + 1
+		x, y = tree['topleft']
+		apples = tree['apples']
+		out += _TREE_RECORD.pack(name_index, int(x), int(y), int(tree['health']), bool(tree['alive']), len(apples))
+		for ax, ay in apples:
+			out += _APPLE_RECORD.pack(int(ax), int(ay))
+	return bytes(out)
+
+
+def _unpack_trees(data):
+	names, pos = _read_strings(data, 0)
+	count, = struct.unpack_from('<I', data, pos)
+	pos += 4
+	trees = []
+	for _ in range(count):
+		name_index, x, y, health, alive, apple_count = _TREE_RECORD.unpack_from(data, pos)
+		pos += _TREE_RECORD.size
+		apples = [list(_APPLE_RECORD.unpack_from(data, pos + i * _APPLE_RECORD.size)) for i in range(apple_count)]
+		pos += apple_count * _APPLE_RECORD.size
+		trees.append({
+			'name': names[name_index - 1] if name_index else None,
+			'topleft': [x, y],
+			'health': health,
+			'alive': bool(alive),
+			'apples': apples,
+		})
+	return trees
+
+
+# section id -> (path of keys inside the save data, pack, unpack)
+_SECTIONS = {
+	_SECTION_GRID: (('level', 'soil', 'grid'), _pack_grid, _unpack_grid),
+	_SECTION_PLANTS: (('level', 'soil', 'plants'), _pack_plants, _unpack_plants),
+	_SECTION_TREES: (('level', 'trees'), _pack_trees, _unpack_trees),
+}
+
+
+def encode_save(data: Dict[str, Any], timestamp: Optional[int] = None, compress: Optional[bool] = None) -> bytes:
+	if compress is None:
+		compress = SAVE_COMPRESS
+	if timestamp is None:
+		timestamp = int(time.time())
+
+	rest = dict(data)
+	sections = []
+	for section_id, (path, pack, _) in _SECTIONS.items():
+		# copy the dicts along the path so the caller's data is left untouched
+		parent = rest
+		try:
+			for key in path[:-1]:
+				parent[key] = dict(parent[key])
+				parent = parent[key]
+			payload = pack(parent[path[-1]])
+		except Exception:
+			continue
+		del parent[path[-1]]
+		sections.append((section_id, payload))
+
+	body = bytearray()
+	text = json.dumps(rest, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+	body += struct.pack('<I', len(text))
+	body += text
+	body.append(len(sections))
+	for section_id, payload in sections:
+		body += struct.pack('<BI', section_id, len(payload))
+		body += payload
+
+	flags = 0
+	if compress:
+		body = zlib.compress(bytes(body), 6)
+		flags |= _FLAG_ZLIB
+	return _HEADER.pack(SAVE_MAGIC, SAVE_VERSION, flags, max(0, int(timestamp))) + bytes(body)
+
+
+def _decode_header(raw: bytes) -> Optional[Dict[str, Any]]:
+	if len(raw) < _HEADER.size:
+		return None
+	magic, version, flags, timestamp = _HEADER.unpack_from(raw, 0)
+	if magic != SAVE_MAGIC:
+		return None
+	return {'version': version, 'flags': flags, 'timestamp': timestamp}
+
+
+def decode_save(raw: bytes) -> Optional[Dict[str, Any]]:
+	"""Inverse of `encode_save`; returns the `{version, timestamp, data}` payload."""
+	header = _decode_header(raw)
+	if header is None or header['version'] != SAVE_VERSION:
+		return None
+	body = memoryview(raw)[_HEADER.size:]
+	if header['flags'] & _FLAG_ZLIB:
+		body = memoryview(zlib.decompress(body))
+
+	length, = struct.unpack_from('<I', body, 0)
+	data = json.loads(bytes(body[4:4 + length]).decode('utf-8'))
+	pos = 4 + length
+	count = body[pos]
+	pos += 1
+	for _ in range(count):
+		section_id, size = struct.unpack_from('<BI', body, pos)
+		pos += struct.calcsize('<BI')
+		payload = body[pos:pos + size]
+		pos += size
+		if section_id not in _SECTIONS:
+			continue
+		path, _, unpack = _SECTIONS[section_id]
+		parent = data
+		for key in path[:-1]:
+			parent = parent.setdefault(key, {})
+		parent[path[-1]] = unpack(payload)
+	return {'version': header['version'], 'timestamp': header['timestamp'], 'data': data}
+
+
+def _read_save_payload(path: str) -> Optional[Dict[str, Any]]:
+	"""Read a binary (v2) or JSON (v1) save file into its payload dict."""
+	raw = _read_bytes(path)
+	if raw is None:
+		return None
+	try:
+		if raw.startswith(SAVE_MAGIC):
+			return decode_save(raw)
+		payload = json.loads(raw.decode('utf-8'))
+	except Exception:
+		return None
+	if not isinstance(payload, dict) or payload.get('version') != SAVE_VERSION_JSON:
+		return None
+	return payload
+
+
 def save_game(data: Dict[str, Any]) -> None:
+	# The old single-save file keeps its JSON format.
 	_ensure_save_dir()
 	payload = {
-		'version': SAVE_VERSION,
+		'version': SAVE_VERSION_JSON,
 		'timestamp': int(time.time()),
 		'data': data,
 	}
@@ -225,17 +556,132 @@ def save_game_slot(slot: int, data: Dict[str, Any]) -> None:
 	s = int(slot)
 	if s < 1 or s > SLOT_COUNT:
 		raise ValueError('Invalid save slot')
+	with _slot_lock:
+		_write_slot(s, data)
+
+
+def _write_slot(s: int, data: Dict[str, Any]) -> None:
 	_ensure_save_dir()
-	payload = {
-		'version': SAVE_VERSION,
-		'timestamp': int(time.time()),
-		'data': data,
-	}
-	text = json.dumps(payload, ensure_ascii=False, indent=2)
+	timestamp = int(time.time())
+	path = _slot_path(s)
 	try:
-		_atomic_write_text(_slot_path(s), text)
+		_atomic_write_bytes(path, encode_save(data, timestamp=timestamp))
 	except Exception:
-		_atomic_write_text(_legacy_slot_path(s), text)
+		# Save dir not writable: fall back to a version-1 JSON slot in `code/`.
+		path = _legacy_slot_path(s)
+		payload = {
+			'version': SAVE_VERSION_JSON,
+			'timestamp': timestamp,
+			'data': data,
+		}
+		_atomic_write_text(path, json.dumps(payload, ensure_ascii=False, indent=2))
+	else:
+		# The binary slot supersedes any version-1 JSON copy of it.
+		try:
+			os.remove(_json_slot_path(s))
+		except OSError:
+			pass
+	_update_index(s, _index_entry(s, path, {'timestamp': timestamp, 'data': data}))
+
+
+class _SaveWorker:
+	"""One background thread that encodes and writes slot saves.
+
+	Jobs are coalesced per slot (a newer snapshot replaces a queued one);
+	finished jobs wait in `done` until the game thread calls `poll()`.
+	"""
+
+	def __init__(self):
+		self.cond = threading.Condition()
+		self.pending = {}
+		self.busy = False
+		self.done = []
+		self.thread = threading.Thread(target=self.run, name='save-writer', daemon=True)
+		self.thread.start()
+
+	def submit(self, slot: int, data: Dict[str, Any], callback=None, before_write=None) -> None:
+		with self.cond:
+			_, __, callbacks = self.pending.pop(slot, (None, None, []))
+			if callback is not None:
+				callbacks.append(callback)
+			self.pending[slot] = (data, before_write, callbacks)
+			self.cond.notify_all()
+
+	def run(self) -> None:
+		while True:
+			with self.cond:
+				while not self.pending:
+					self.cond.wait()
+				slot = next(iter(self.pending))
+				data, before_write, callbacks = self.pending.pop(slot)
+				self.busy = True
+			error = None
+			try:
+				if before_write is not None:
+					try:
+						before_write()
+					except Exception:
+						pass
+				save_game_slot(slot, data)
+			except Exception as e:
+				error = e
+			with self.cond:
+				self.busy = False
+				self.done.extend((callback, slot, error) for callback in callbacks)
+				self.cond.notify_all()
+
+	def idle(self) -> bool:
+		return not self.pending and not self.busy
+
+	def flush(self, timeout: Optional[float] = None) -> bool:
+		with self.cond:
+			return self.cond.wait_for(self.idle, timeout)
+
+	def poll(self) -> int:
+		with self.cond:
+			done, self.done = self.done, []
+		for callback, slot, error in done:
+			callback(slot, error)
+		return len(done)
+
+
+_worker: Optional[_SaveWorker] = None
+
+
+def save_game_slot_async(slot: int, data: Dict[str, Any], callback=None, before_write=None) -> None:
+	"""Queue `data` to be written to `slot` on the save worker thread.
+
+	`data` is handed over as-is, so the caller must not mutate it afterwards
+	(`Level.serialize_state()` always builds fresh containers). The optional
+	`before_write()` runs on the worker first (e.g. writing the thumbnail);
+	its errors are ignored. `callback(slot, error)` runs on the caller's
+	thread from `poll_saves()`; `error` is None on success.
+	"""
+	global _worker
+	s = int(slot)
+	if s < 1 or s > SLOT_COUNT:
+		raise ValueError('Invalid save slot')
+	if _worker is None:
+		_worker = _SaveWorker()
+	_worker.submit(s, data, callback, before_write)
+
+
+def saves_pending() -> bool:
+	return _worker is not None and not _worker.flush(0)
+
+
+def flush_saves(timeout: Optional[float] = None) -> bool:
+	"""Block until every queued save is on disk; False if `timeout` ran out."""
+	if _worker is None:
+		return True
+	return _worker.flush(timeout)
+
+
+def poll_saves() -> int:
+	"""Run callbacks of finished background saves; returns how many ran."""
+	if _worker is None:
+		return 0
+	return _worker.poll()
 
 
 def load_game() -> Optional[Dict[str, Any]]:
@@ -244,16 +690,8 @@ def load_game() -> Optional[Dict[str, Any]]:
 		path = _legacy_save_path()
 		if not os.path.exists(path):
 			return None
-	try:
-		with open(path, 'r', encoding='utf-8') as f:
-			payload = json.load(f)
-	except Exception:
-		return None
-
-	if not isinstance(payload, dict):
-		return None
-	if payload.get('version') != SAVE_VERSION:
-		# For now we only support version 1.
+	payload = _read_save_payload(path)
+	if payload is None:
 		return None
 
 	data = payload.get('data')
@@ -264,42 +702,46 @@ def load_game_slot(slot: int) -> Optional[Dict[str, Any]]:
 	s = int(slot)
 	if s < 1 or s > SLOT_COUNT:
 		return None
-	path = _slot_path(s)
-	if not os.path.exists(path):
-		path = _legacy_slot_path(s)
+	flush_saves()
+	path = _existing_slot_path(s)
 	# Legacy support: if slot1 doesn't exist, use savegame.json
-	if not os.path.exists(path) and s == 1 and save_exists():
+	if path is None and s == 1 and save_exists():
 		return load_game()
-	if not os.path.exists(path):
-		return None
-	try:
-		with open(path, 'r', encoding='utf-8') as f:
-			payload = json.load(f)
-	except Exception:
-		return None
-
-	if not isinstance(payload, dict):
+	if path is None:
 		return None
-	if payload.get('version') != SAVE_VERSION:
+	payload = _read_save_payload(path)
+	if payload is None:
 		return None
 
 	data = payload.get('data')
 	return data if isinstance(data, dict) else None
 
 
-def _load_slot_meta(slot: int) -> Optional[Dict[str, Any]]:
+def _slot_meta_path(slot: int) -> Optional[str]:
 	s = int(slot)
-	path = _slot_path(s)
-	if not os.path.exists(path):
-		path = _legacy_slot_path(s)
-	if not os.path.exists(path):
+	path = _existing_slot_path(s)
+	if path is None:
 		# Legacy support for slot1 single-save
 		if s == 1 and os.path.exists(_legacy_save_path()):
 			path = _legacy_save_path()
 		elif s == 1 and os.path.exists(_save_path()):
 			path = _save_path()
-		else:
-			return None
+	return path
+
+
+def _load_slot_meta(slot: int) -> Optional[Dict[str, Any]]:
+	path = _slot_meta_path(slot)
+	if path is None:
+		return None
+	# Binary saves keep the timestamp in a fixed header: no need to read the body.
+	try:
+		with open(path, 'rb') as f:
+			head = f.read(_HEADER.size)
+	except Exception:
+		return None
+	header = _decode_header(head)
+	if header is not None:
+		return header
 	try:
 		with open(path, 'r', encoding='utf-8') as f:
 			payload = json.load(f)
@@ -308,37 +750,167 @@ def _load_slot_meta(slot: int) -> Optional[Dict[str, Any]]:
 	return payload if isinstance(payload, dict) else None
 
 
-def slot_summary(slot: int) -> Dict[str, Any]:
-	meta = _load_slot_meta(slot)
-	if not meta:
-		return {'exists': False}
+def _file_key(path: str):
+	# Identifies one version of a slot file without reading it.
+	try:
+		stat = os.stat(path)
+	except OSError:
+		return None
+	return [path, stat.st_mtime_ns, stat.st_size]
+
+
+def _index_entry(slot: int, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+	data = payload.get('data')
+	level = data.get('level') if isinstance(data, dict) else None
+	level = level if isinstance(level, dict) else {}
+	player = level.get('player')
+	player = player if isinstance(player, dict) else {}
+	thumbnail = thumbnail_path(slot)
 	return {
-		'exists': True,
-		'timestamp': meta.get('timestamp'),
+		'file': _file_key(path),
+		'timestamp': payload.get('timestamp'),
+		'play_time': level.get('play_time'),
+		'money': player.get('money'),
+		'day': level.get('day'),
+		'thumbnail': os.path.basename(thumbnail) if os.path.exists(thumbnail) else None,
 	}
 
 
-def format_slot_label(slot: int) -> str:
-	info = slot_summary(slot)
+def _load_index() -> Dict[str, Any]:
+	try:
+		with open(_index_path(), 'r', encoding='utf-8') as f:
+			index = json.load(f)
+	except Exception:
+		return {}
+	if not isinstance(index, dict) or index.get('version') != INDEX_VERSION:
+		return {}
+	slots = index.get('slots')
+	return slots if isinstance(slots, dict) else {}
+
+
+def _write_index(slots: Dict[str, Any]) -> None:
+	_ensure_save_dir()
+	text = json.dumps({'version': INDEX_VERSION, 'slots': slots}, ensure_ascii=False, separators=(',', ':'))
+	try:
+		_atomic_write_text(_index_path(), text)
+	except Exception:
+		# The index is only a cache; `slot_index` rebuilds it next time.
+		pass
+
+
+def _update_index(slot: int, entry: Optional[Dict[str, Any]]) -> None:
+	slots = _load_index()
+	if entry is None:
+		slots.pop(str(int(slot)), None)
+	else:
+		slots[str(int(slot))] = entry
+	_write_index(slots)
+
+
+def slot_index() -> Dict[int, Optional[Dict[str, Any]]]:
+	"""Summary of every slot (None when empty), read from the index file.
+
+	An entry is trusted while its slot file's path, mtime and size still
+	match; otherwise that one slot is re-read and the index rewritten.
+	"""
+	# The index file is replaced atomically, so reading it needs no lock;
+	# only a rebuild waits for a background save to finish.
+	result = _cached_slot_index()
+	if result is None:
+		with _slot_lock:
+			result = _build_slot_index()
+	return result
+
+
+def _cached_slot_index() -> Optional[Dict[int, Optional[Dict[str, Any]]]]:
+	# None as soon as one entry no longer matches its slot file
+	slots = _load_index()
+	result = {}
+	for slot in list_slots():
+		path = _slot_meta_path(slot)
+		file_key = _file_key(path) if path else None
+		entry = slots.get(str(slot))
+		if file_key is None:
+			if entry is not None:
+				return None
+			result[slot] = None
+			continue
+		if not isinstance(entry, dict) or entry.get('file') != file_key:
+			return None
+		result[slot] = entry
+	return result
+
+
+def _build_slot_index() -> Dict[int, Optional[Dict[str, Any]]]:
+	slots = _load_index()
+	changed = False
+	result = {}
+	for slot in list_slots():
+		key = str(slot)
+		path = _slot_meta_path(slot)
+		file_key = _file_key(path) if path else None
+		entry = slots.get(key)
+		if file_key is None:
+			if entry is not None:
+				del slots[key]
+				changed = True
+			result[slot] = None
+			continue
+		if not isinstance(entry, dict) or entry.get('file') != file_key:
+			payload = _read_save_payload(path) or _load_slot_meta(slot) or {}
+			entry = slots[key] = _index_entry(slot, path, payload)
+			changed = True
+		result[slot] = entry
+	if changed:
+		_write_index(slots)
+	return result
+
+
+def slot_summary(slot: int) -> Dict[str, Any]:
+	entry = slot_index().get(int(slot))
+	if not entry:
+		return {'exists': False}
+	summary = dict(entry, exists=True)
+	summary.pop('file', None)
+	return summary
+
+
+def format_slot_label(slot: int, info: Optional[Dict[str, Any]] = None) -> str:
+	if info is None:
+		info = slot_summary(slot)
 	if not info.get('exists'):
 		return f'Slot {slot}: Kosong'
 	try:
+		day = f'Hari {int(info["day"])}, ' if info.get('day') else ''
 		ts = int(info.get('timestamp') or 0)
 		if ts <= 0:
-			return f'Slot {slot}: Ada'
+			return f'Slot {slot}: {day}Ada'
 		# Local time string
 		stamp = time.strftime('%Y-%m-%d %H:%M', time.localtime(ts))
-		return f'Slot {slot}: {stamp}'
+		return f'Slot {slot}: {day}{stamp}'
 	except Exception:
 		return f'Slot {slot}: Ada'
 
 
+def format_slot_labels():
+	"""Labels for every slot from a single index read."""
+	index = slot_index()
+	labels = []
+	for slot in list_slots():
+		entry = index.get(slot)
+		labels.append(format_slot_label(slot, dict(entry, exists=True) if entry else {'exists': False}))
+	return labels
+
+
 def save_settings(data: Dict[str, Any]) -> None:
+	"""Write `data` into config.json; keys not in `data` keep their stored value."""
 	_ensure_save_dir()
+	merged = load_settings() or {}
+	merged.update(data)
 	payload = {
 		'version': CONFIG_VERSION,
 		'timestamp': int(time.time()),
-		'data': data,
+		'data': merged,
 	}
 	text = json.dumps(payload, ensure_ascii=False, indent=2)
 	try:
@@ -3,6 +3,22 @@ from pygame.math import Vector2
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 TILE_SIZE = 64
+# static map layers are pre-rendered into chunks of this size (pixels)
+MAP_CHUNK_SIZE = 512
+
+# rendered menu/HUD labels kept by support.render_text (least recently used go first)
+TEXT_CACHE_SIZE = 256
+
+# frame pacing: FPS_CAP 0 means uncapped; menus and the pause screen idle at
+# IDLE_FPS and only redraw after input; dt is clamped after stalls
+FPS_CAP = 60
+FPS_OPTIONS = [30, 60, 120, 144, 0]
+IDLE_FPS = 30
+MAX_FRAME_DT = 0.1
+
+# the evening tint steps this many colour levels at a time (1 = smooth);
+# larger steps refill the full-screen tint surface less often
+SKY_TINT_STEP = 1
 
 # audio (0.0 - 1.0)
 MUSIC_VOLUME = 0.4
@@ -30,8 +46,8 @@ def _recompute_derived():
 def set_resolution(width: int, height: int):
 	"""Update global resolution values and derived layout constants.
 
-	Note: This project uses `from settings import *` in many modules.
-	To avoid stale values, pick the resolution BEFORE importing Level.
+	Screen-size dependent code reads `settings.SCREEN_*` rather than the
+	star-imported copies; a running Level follows with `Level.resize()`.
 	"""
 	global SCREEN_WIDTH, SCREEN_HEIGHT
 	SCREEN_WIDTH = int(width)
@@ -62,6 +78,12 @@ LAYERS = {
 	'rain drops': 10
 }
 
+# rain particles spawned per second, for both the splashes and the falling drops
+RAIN_SPAWN_RATE = 120
+
+# seconds between autosaves of the current slot (0 = only when a new day starts)
+AUTOSAVE_INTERVAL = 60
+
 APPLE_POS = {
 	'Small': [(18,17), (30,37), (12,50), (30,45), (20,30), (30,10)],
 	'Large': [(30,24), (60,65), (50,50), (16,40),(45,50), (42,70)]
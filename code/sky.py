@@ -1,72 +1,155 @@
 import pygame 
+import settings
 from settings import *
-from support import import_folder
-from sprites import Generic
+from support import import_folder, load_image
 from random import randint, choice
+from math import ceil
 
 class Sky:
 	def __init__(self):
-		self.display_surface = pygame.display.get_surface()
-		self.full_surf = pygame.Surface((SCREEN_WIDTH,SCREEN_HEIGHT))
-		self.start_color = [255,255,255]
 		self.end_color = (38,101,189)
+		self.build_ramp()
+		# how far every channel has faded from white (all fade at the same rate)
+		self.drop = 0.0
+		self.resize()
+
+	def build_ramp(self):
+		# the tint for each whole step of `drop`; channels stop at end_color
+		self.max_drop = 255 - min(self.end_color)
+		step = max(1, int(SKY_TINT_STEP))
+		self.ramp = [
+			tuple(max(255 - drop // step * step, end) for end in self.end_color)
+			for drop in range(self.max_drop + 1)]
+
+	def resize(self):
+		self.display_surface = pygame.display.get_surface()
+		self.full_surf = pygame.Surface((settings.SCREEN_WIDTH,settings.SCREEN_HEIGHT))
+		self.tint = None
+
+	@property
+	def start_color(self):
+		"""Current tint as floats (saved with the level)."""
+		return [max(255 - self.drop, end) for end in self.end_color]
 
-	def display(self, dt):
-		for index, value in enumerate(self.end_color):
-			if self.start_color[index] > value:
-				self.start_color[index] -= 2 * dt
+	@start_color.setter
+	def start_color(self, color):
+		self.drop = min(max(0.0, 255 - float(color[0])), self.max_drop)
 
-		self.full_surf.fill(self.start_color)
+	def update(self, dt):
+		if self.drop < self.max_drop:
+			self.drop = min(self.drop + 2 * dt, self.max_drop)
+
+	def draw(self):
+		# pygame truncates float colours, so 254.3 is drawn as 254: round the drop up
+		tint = self.ramp[min(ceil(self.drop), self.max_drop)]
+		if tint == (255,255,255):
+			# multiplying by white changes nothing
+			return
+		if tint != self.tint:
+			self.full_surf.fill(tint)
+			self.tint = tint
 		self.display_surface.blit(self.full_surf, (0,0), special_flags = pygame.BLEND_RGBA_MULT)
 
-class Drop(Generic):
-	def __init__(self, surf, pos, moving, groups, z):
-		
-		# general setup
-		super().__init__(pos, surf, groups, z)
+class Drop:
+	__slots__ = ('surf', 'x', 'y', 'width', 'height', 'speed', 'lifetime', 'age')
+
+	def __init__(self):
+		self.surf = None
+		self.x = self.y = 0.0
+		self.width = self.height = 0
+		self.speed = 0
+		self.lifetime = 0
+		self.age = 0
+
+	def reset(self, surf, pos, speed):
+		self.surf = surf
+		self.x, self.y = pos
+		self.width, self.height = surf.get_size()
+		self.speed = speed
 		self.lifetime = randint(400,500)
-		self.start_time = pygame.time.get_ticks()
+		self.age = 0
+
+class DropLayer:
+	"""Fixed pool of drops spawned at a steady rate and drawn in one batch."""
 
-		# moving 
+	def __init__(self, surfs, area, moving, pool_size):
+		self.surfs = surfs
+		self.area = area
 		self.moving = moving
-		if self.moving:
-			self.pos = pygame.math.Vector2(self.rect.topleft)
-			self.direction = pygame.math.Vector2(-2,4)
-			self.speed = randint(200,250)
+		self.direction = pygame.math.Vector2(-2,4)
+		self.free = [Drop() for _ in range(pool_size)]
+		self.active = []
+		self.spawn_budget = 0.0
 
-	def update(self,dt):
-		# movement
-		if self.moving:
-			self.pos += self.direction * self.speed * dt
-			self.rect.topleft = (round(self.pos.x), round(self.pos.y))
+	def spawn(self, count):
+		for _ in range(min(count, len(self.free))):
+			drop = self.free.pop()
+			speed = randint(200,250) if self.moving else 0
+			drop.reset(choice(self.surfs), (randint(0,self.area[0]),randint(0,self.area[1])), speed)
+			self.active.append(drop)
 
-		# timer
-		if pygame.time.get_ticks() - self.start_time >= self.lifetime:
-			self.kill()
+	def update(self, dt, spawn_rate):
+		# spawn by rate, not per frame, so drop density doesn't follow FPS
+		self.spawn_budget += spawn_rate * dt
+		count = int(self.spawn_budget)
+		self.spawn_budget -= count
+
+		elapsed = dt * 1000
+		dx, dy = self.direction.x * dt, self.direction.y * dt
+		alive = []
+		for drop in self.active:
+			drop.age += elapsed
+			if drop.age >= drop.lifetime:
+				self.free.append(drop)
+				continue
+			if drop.speed:
+				drop.x += dx * drop.speed
+				drop.y += dy * drop.speed
+			alive.append(drop)
+		self.active = alive
+
+		if count:
+			self.spawn(count)
+
+	def clear(self):
+		self.free.extend(self.active)
+		self.active = []
+		self.spawn_budget = 0.0
+
+	def draw(self, surface, offset, camera_rect):
+		left, top, right, bottom = camera_rect.left, camera_rect.top, camera_rect.right, camera_rect.bottom
+		ox, oy = offset.x, offset.y
+		surface.blits([
+			(drop.surf, (round(drop.x) - ox, round(drop.y) - oy))
+			for drop in self.active
+			if drop.x < right and drop.y < bottom and drop.x + drop.width > left and drop.y + drop.height > top
+		], False)
 
 class Rain:
 	def __init__(self, all_sprites):
 		self.all_sprites = all_sprites
 		self.rain_drops = import_folder('../graphics/rain/drops/')
 		self.rain_floor = import_folder('../graphics/rain/floor/')
-		self.floor_w, self.floor_h =  pygame.image.load('../graphics/world/ground.png').get_size()
-
-	def create_floor(self):
-		Drop(
-			surf = choice(self.rain_floor), 
-			pos = (randint(0,self.floor_w),randint(0,self.floor_h)), 
-			moving = False, 
-			groups = self.all_sprites, 
-			z = LAYERS['rain floor'])
-
-	def create_drops(self):
-		Drop(
-			surf = choice(self.rain_drops), 
-			pos = (randint(0,self.floor_w),randint(0,self.floor_h)), 
-			moving = True, 
-			groups = self.all_sprites, 
-			z = LAYERS['rain drops'])
-
-	def update(self):
-		self.create_floor()
-		self.create_drops()
\ No newline at end of file
+		self.floor_w, self.floor_h =  load_image('../graphics/world/ground.png').get_size()
+
+		# drops live at most 0.5s, so a pool of rate / 2 (+ slack) is never exhausted
+		pool_size = int(RAIN_SPAWN_RATE * 0.5) + 16
+		area = (self.floor_w, self.floor_h)
+		self.floor = DropLayer(self.rain_floor, area, moving = False, pool_size = pool_size)
+		self.drops = DropLayer(self.rain_drops, area, moving = True, pool_size = pool_size)
+
+		# drawn by the camera as part of their z-layers, not as individual sprites
+		all_sprites.add_layer_drawer(LAYERS['rain floor'], self.floor.draw)
+		all_sprites.add_layer_drawer(LAYERS['rain drops'], self.drops.draw)
+
+	def __len__(self):
+		return len(self.floor.active) + len(self.drops.active)
+
+	def update(self, dt, spawn = True):
+		rate = RAIN_SPAWN_RATE if spawn else 0
+		self.floor.update(dt, rate)
+		self.drops.update(dt, rate)
+
+	def clear(self):
+		self.floor.clear()
+		self.drops.clear()
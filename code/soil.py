@@ -1,11 +1,128 @@
 import pygame
+import settings
 from settings import *
-from pytmx.util_pygame import load_pygame
+from mapcache import load_map
 from support import *
 from random import choice
+from spatial import refresh_hitbox
+
+# neighbour bit -> grid offset (top, right, bottom, left)
+NEIGHBOUR_BITS = (
+	(1, (0, -1)),
+	(2, (1, 0)),
+	(4, (0, 1)),
+	(8, (-1, 0)),
+)
+
+# neighbour mask (t=1, r=2, b=4, l=8) -> soil graphic
+SOIL_TILE_TYPES = (
+	'o', 'b', 'l', 'bl',
+	't', 'tb', 'tl', 'tbr',
+	'r', 'br', 'lr', 'lrb',
+	'tr', 'tbl', 'lrt', 'x',
+)
+
+# per-cell soil state bits
+SOIL_FLAGS = {
+	'F': 1, # farmable
+	'X': 2, # tilled
+	'W': 4, # watered
+	'P': 8, # planted
+}
+
+class SoilGrid:
+	"""Soil state packed as one bitfield byte per cell (see SOIL_FLAGS)."""
+
+	def __init__(self, width, height):
+		self.width = width
+		self.height = height
+		self.cells = bytearray(width * height)
+
+	def inside(self, x, y):
+		return 0 <= x < self.width and 0 <= y < self.height
+
+	def has(self, x, y, flag):
+		return self.inside(x, y) and bool(self.cells[y * self.width + x] & SOIL_FLAGS[flag])
+
+	def set(self, x, y, flag):
+		self.cells[y * self.width + x] |= SOIL_FLAGS[flag]
+
+	def clear(self, x, y, flag):
+		self.cells[y * self.width + x] &= ~SOIL_FLAGS[flag] & 0xFF
+
+	def clear_all(self, flag):
+		bit = SOIL_FLAGS[flag]
+		self.cells = self.cells.translate(bytes(v & ~bit & 0xFF for v in range(256)))
+
+	def set_where(self, flag, required):
+		bit, req = SOIL_FLAGS[flag], SOIL_FLAGS[required]
+		self.cells = self.cells.translate(bytes(v | bit if v & req else v for v in range(256)))
+
+	def count(self, flag, without = None):
+		bit = SOIL_FLAGS[flag]
+		skip = SOIL_FLAGS[without] if without else 0
+		return sum(self.cells.count(v) for v in range(1, 16) if v & bit and not v & skip)
+
+	def positions(self, flag, without = None):
+		"""Yield (x, y) of every cell with `flag` set (and `without` clear)."""
+		bit = SOIL_FLAGS[flag]
+		skip = SOIL_FLAGS[without] if without else 0
+		found = []
+		for value in range(1, 16):
+			if not value & bit or value & skip:
+				continue
+			index = self.cells.find(value)
+			while index != -1:
+				found.append(index)
+				index = self.cells.find(value, index + 1)
+		for index in sorted(found):
+			yield index % self.width, index // self.width
+
+	def to_lists(self):
+		# legacy list-of-flags form, kept for save files
+		flags = SOIL_FLAGS.items()
+		return [
+			[[name for name, bit in flags if self.cells[y * self.width + x] & bit] for x in range(self.width)]
+			for y in range(self.height)]
+
+	@classmethod
+	def from_lists(cls, grid):
+		height = len(grid)
+		width = max(len(row) for row in grid)
+		soil_grid = cls(width, height)
+		for y, row in enumerate(grid):
+			for x, cell in enumerate(row):
+				for name in cell:
+					if name in SOIL_FLAGS:
+						soil_grid.set(x, y, name)
+		return soil_grid
+
+class CellGroup(pygame.sprite.Group):
+	"""Group that also indexes its members by grid cell (`sprite.cell`)."""
+
+	def __init__(self):
+		super().__init__()
+		self.cells = {}
+
+	def add_internal(self, sprite, layer = None):
+		super().add_internal(sprite, layer)
+		self.cells[sprite.cell] = sprite
+
+	def remove_internal(self, sprite):
+		super().remove_internal(sprite)
+		if self.cells.get(sprite.cell) is sprite:
+			del self.cells[sprite.cell]
+
+	def at(self, cell):
+		return self.cells.get(cell)
+
+def cell_at(pos):
+	return (int(pos[0] // TILE_SIZE), int(pos[1] // TILE_SIZE))
 
 class SoilTile(pygame.sprite.Sprite):
 	def __init__(self, pos, surf, groups):
+		# set before joining groups: CellGroup indexes by it
+		self.cell = cell_at(pos)
 		super().__init__(groups)
 		self.image = surf
 		self.rect = self.image.get_rect(topleft = pos)
@@ -13,23 +130,27 @@ class SoilTile(pygame.sprite.Sprite):
 
 class WaterTile(pygame.sprite.Sprite):
 	def __init__(self, pos, surf, groups):
+		self.cell = cell_at(pos)
 		super().__init__(groups)
 		self.image = surf
 		self.rect = self.image.get_rect(topleft = pos)
 		self.z = LAYERS['soil water']
 
 class Plant(pygame.sprite.Sprite):
-	def __init__(self, plant_type, groups, soil, check_watered):
+	def __init__(self, plant_type, groups, soil, ripe_group = None):
+		self.cell = soil.cell
 		super().__init__(groups)
 		
 		# setup
 		self.plant_type = plant_type
 		self.frames = import_folder(f'../graphics/fruit/{plant_type}')
 		self.soil = soil
-		self.check_watered = check_watered
+		# harvestable plants join this group (SoilLayer.ripe_sprites)
+		self.ripe_group = ripe_group
 
-		# plant growing 
+		# plant growing: age counts watered nights * grow_speed, stage is the frame shown
 		self.age = 0
+		self.stage = 0
 		self.max_age = len(self.frames) - 1
 		self.grow_speed = GROW_SPEED[plant_type]
 		self.harvestable = False
@@ -40,101 +161,117 @@ class Plant(pygame.sprite.Sprite):
 		self.rect = self.image.get_rect(midbottom = soil.rect.midbottom + pygame.math.Vector2(0,self.y_offset))
 		self.z = LAYERS['ground plant']
 
-	def grow(self):
-		if self.check_watered(self.rect.center):
-			self.age += self.grow_speed
-
-			if int(self.age) > 0:
-				self.z = LAYERS['main']
-				self.hitbox = self.rect.copy().inflate(-26,-self.rect.height * 0.4)
-
-			if self.age >= self.max_age:
-				self.age = self.max_age
-				self.harvestable = True
-
-			self.image = self.frames[int(self.age)]
-			self.rect = self.image.get_rect(midbottom = self.soil.rect.midbottom + pygame.math.Vector2(0,self.y_offset))
+	def grow(self, nights = 1):
+		"""Age by `nights` watered nights; the sprite only changes with the stage."""
+		if self.harvestable:
+			return
+		self.age += self.grow_speed * nights
+		if self.age >= self.max_age:
+			self.age = self.max_age
+			self.ripen()
+
+		stage = int(self.age)
+		if stage != self.stage:
+			self.set_stage(stage)
+
+	def ripen(self):
+		self.harvestable = True
+		if self.ripe_group is not None:
+			self.add(self.ripe_group)
+
+	def set_stage(self, stage):
+		self.stage = stage
+		self.image = self.frames[stage]
+		self.rect = self.image.get_rect(midbottom = self.soil.rect.midbottom + pygame.math.Vector2(0,self.y_offset))
+		if stage > 0:
+			self.z = LAYERS['main']
+			self.hitbox = self.rect.copy().inflate(-26,-self.rect.height * 0.4)
+			refresh_hitbox(self)
 
 class SoilLayer:
-	def __init__(self, all_sprites, collision_sprites):
+	def __init__(self, all_sprites, collision_sprites, mark_dirty = None):
+
+		self.mark_dirty = mark_dirty or ignore_dirty
 
 		# sprite groups
 		self.all_sprites = all_sprites
 		self.collision_sprites = collision_sprites
-		self.soil_sprites = pygame.sprite.Group()
-		self.water_sprites = pygame.sprite.Group()
-		self.plant_sprites = pygame.sprite.Group()
+		# tool actions look their target up by cell instead of scanning the groups
+		self.soil_sprites = CellGroup()
+		self.water_sprites = CellGroup()
+		self.plant_sprites = CellGroup()
+		self.ripe_sprites = CellGroup()
 
 		# graphics
 		self.soil_surfs = import_folder_dict('../graphics/soil/')
 		self.water_surfs = import_folder('../graphics/soil_water')
 
 		self.create_soil_grid()
-		self.create_hit_rects()
 
 		# sounds
-		self.hoe_sound = pygame.mixer.Sound('../audio/hoe.wav')
-		self.hoe_sound.set_volume(SFX_VOLUME)
+		self.hoe_sound = load_sound('../audio/hoe.wav')
+		self.hoe_sound.set_volume(settings.SFX_VOLUME)
+
+		self.plant_sound = load_sound('../audio/plant.wav') 
+		self.plant_sound.set_volume(settings.SFX_VOLUME)
 
-		self.plant_sound = pygame.mixer.Sound('../audio/plant.wav') 
-		self.plant_sound.set_volume(SFX_VOLUME)
+	@property
+	def grid(self):
+		"""List-of-flags view of the soil state (e.g. [['F', 'X'], ...]) for save files."""
+		return self.soil_grid.to_lists()
+
+	@grid.setter
+	def grid(self, grid):
+		self.soil_grid = SoilGrid.from_lists(grid)
 
 	def create_soil_grid(self):
-		ground = pygame.image.load('../graphics/world/ground.png')
+		ground = load_image('../graphics/world/ground.png')
 		h_tiles, v_tiles = ground.get_width() // TILE_SIZE, ground.get_height() // TILE_SIZE
 		
-		self.grid = [[[] for col in range(h_tiles)] for row in range(v_tiles)]
-		for x, y, _ in load_pygame('../data/map.tmx').get_layer_by_name('Farmable').tiles():
-			self.grid[y][x].append('F')
-
-	def create_hit_rects(self):
-		self.hit_rects = []
-		for index_row, row in enumerate(self.grid):
-			for index_col, cell in enumerate(row):
-				if 'F' in cell:
-					x = index_col * TILE_SIZE
-					y = index_row * TILE_SIZE
-					rect = pygame.Rect(x,y,TILE_SIZE, TILE_SIZE)
-					self.hit_rects.append(rect)
+		self.soil_grid = SoilGrid(h_tiles, v_tiles)
+		for x, y in load_map('../data/map.tmx').cells('Farmable'):
+			self.soil_grid.set(x, y, 'F')
 
 	def get_hit(self, point):
-		for rect in self.hit_rects:
-			if rect.collidepoint(point):
-				try:
-					self.hoe_sound.set_volume(SFX_VOLUME)
-				except Exception:
-					pass
-				self.hoe_sound.play()
-
-				x = rect.x // TILE_SIZE
-				y = rect.y // TILE_SIZE
-
-				if 'F' in self.grid[y][x]:
-					self.grid[y][x].append('X')
-					self.create_soil_tiles()
-					if self.raining:
-						self.water_all()
+		x, y = cell_at(point)
+		if not self.soil_grid.has(x, y, 'F'):
+			return
+		try:
+			self.hoe_sound.set_volume(settings.SFX_VOLUME)
+		except Exception:
+			pass
+		self.hoe_sound.play()
+
+		if not self.soil_grid.has(x, y, 'X'):
+			self.soil_grid.set(x, y, 'X')
+			self.update_soil_area(x, y)
+			self.mark_dirty('soil')
+		if self.raining:
+			self.water_all()
 
 	def water(self, target_pos):
-		for soil_sprite in self.soil_sprites.sprites():
-			if soil_sprite.rect.collidepoint(target_pos):
+		soil_sprite = self.soil_sprites.at(cell_at(target_pos))
+		if soil_sprite is None:
+			return
 
-				x = soil_sprite.rect.x // TILE_SIZE
-				y = soil_sprite.rect.y // TILE_SIZE
-				self.grid[y][x].append('W')
+		x, y = soil_sprite.cell
+		if self.soil_grid.has(x, y, 'W'):
+			return
+		self.soil_grid.set(x, y, 'W')
+		self.mark_dirty('soil')
 
-				pos = soil_sprite.rect.topleft
-				surf = choice(self.water_surfs)
-				WaterTile(pos, surf, [self.all_sprites, self.water_sprites])
+		pos = soil_sprite.rect.topleft
+		surf = choice(self.water_surfs)
+		WaterTile(pos, surf, [self.all_sprites, self.water_sprites])
 
 	def water_all(self):
-		for index_row, row in enumerate(self.grid):
-			for index_col, cell in enumerate(row):
-				if 'X' in cell and 'W' not in cell:
-					cell.append('W')
-					x = index_col * TILE_SIZE
-					y = index_row * TILE_SIZE
-					WaterTile((x,y), choice(self.water_surfs), [self.all_sprites, self.water_sprites])
+		dry = list(self.soil_grid.positions('X', without = 'W'))
+		if not dry:
+			return
+		for x, y in dry:
+			WaterTile((x * TILE_SIZE, y * TILE_SIZE), choice(self.water_surfs), [self.all_sprites, self.water_sprites])
+		self.soil_grid.set_where('W', 'X')
+		self.mark_dirty('soil')
 
 	def remove_water(self):
 
@@ -143,78 +280,89 @@ class SoilLayer:
 			sprite.kill()
 
 		# clean up the grid
-		for row in self.grid:
-			for cell in row:
-				if 'W' in cell:
-					cell.remove('W')
-
-	def check_watered(self, pos):
-		x = pos[0] // TILE_SIZE
-		y = pos[1] // TILE_SIZE
-		cell = self.grid[y][x]
-		is_watered = 'W' in cell
-		return is_watered
+		if self.soil_grid.count('W'):
+			self.soil_grid.clear_all('W')
+			self.mark_dirty('soil')
 
 	def plant_seed(self, target_pos, seed):
-		for soil_sprite in self.soil_sprites.sprites():
-			if soil_sprite.rect.collidepoint(target_pos):
-				try:
-					self.plant_sound.set_volume(SFX_VOLUME)
-				except Exception:
-					pass
-				self.plant_sound.play()
-
-				x = soil_sprite.rect.x // TILE_SIZE
-				y = soil_sprite.rect.y // TILE_SIZE
-
-				if 'P' not in self.grid[y][x]:
-					self.grid[y][x].append('P')
-					Plant(seed, [self.all_sprites, self.plant_sprites, self.collision_sprites], soil_sprite, self.check_watered)
-
-	def update_plants(self):
-		for plant in self.plant_sprites.sprites():
-			plant.grow()
+		soil_sprite = self.soil_sprites.at(cell_at(target_pos))
+		if soil_sprite is None:
+			return
+		try:
+			self.plant_sound.set_volume(settings.SFX_VOLUME)
+		except Exception:
+			pass
+		self.plant_sound.play()
+
+		x, y = soil_sprite.cell
+		if not self.soil_grid.has(x, y, 'P'):
+			self.soil_grid.set(x, y, 'P')
+			Plant(seed, [self.all_sprites, self.plant_sprites, self.collision_sprites], soil_sprite, self.ripe_sprites)
+			self.mark_dirty('soil')
+			self.mark_dirty('plants')
+
+	def ripe_plants_near(self, rect):
+		"""Harvestable plants whose cell could overlap `rect`.
+
+		A plant is drawn a little above its soil tile (see Plant.y_offset), so
+		the row below the rect is checked too.
+		"""
+		if not self.ripe_sprites:
+			return []
+		left, right = rect.left // TILE_SIZE, (rect.right - 1) // TILE_SIZE
+		top, bottom = rect.top // TILE_SIZE, (rect.bottom - 1) // TILE_SIZE + 1
+		cells = self.ripe_sprites.cells
+		return [cells[(x, y)] for y in range(top, bottom + 1) for x in range(left, right + 1) if (x, y) in cells]
+
+	def update_plants(self, rainy_nights = 0):
+		"""Grow the plants for one night, plus `rainy_nights` skipped nights on which
+		rain watered every tilled cell (see Level.advance_days).
+
+		For a single night only plants on watered cells are visited.
+		"""
+		if rainy_nights:
+			plants = self.plant_sprites.sprites()
+			for plant in plants:
+				plant.grow(rainy_nights + self.soil_grid.has(*plant.cell, 'W'))
+		else:
+			plants = list(filter(None, map(self.plant_sprites.at, self.soil_grid.positions('W'))))
+			for plant in plants:
+				plant.grow()
+		if plants:
+			self.mark_dirty('plants')
+
+	def soil_mask(self, x, y):
+		mask = 0
+		for bit, (dx, dy) in NEIGHBOUR_BITS:
+			if self.soil_grid.has(x + dx, y + dy, 'X'):
+				mask |= bit
+		return mask
+
+	def update_soil_tile(self, x, y):
+		tile = self.soil_sprites.at((x, y))
+		if not self.soil_grid.has(x, y, 'X'):
+			if tile is not None:
+				tile.kill()
+			return
+
+		surf = self.soil_surfs[SOIL_TILE_TYPES[self.soil_mask(x, y)]]
+		if tile is None:
+			SoilTile(
+				pos = (x * TILE_SIZE, y * TILE_SIZE),
+				surf = surf,
+				groups = [self.all_sprites, self.soil_sprites])
+		else:
+			tile.image = surf
+
+	def update_soil_area(self, x, y):
+		# a tilled cell only changes its own tile and its 4 neighbours
+		self.update_soil_tile(x, y)
+		for _, (dx, dy) in NEIGHBOUR_BITS:
+			if self.soil_grid.inside(x + dx, y + dy):
+				self.update_soil_tile(x + dx, y + dy)
 
 	def create_soil_tiles(self):
-		self.soil_sprites.empty()
-		for index_row, row in enumerate(self.grid):
-			for index_col, cell in enumerate(row):
-				if 'X' in cell:
-					
-					# tile options 
-					t = 'X' in self.grid[index_row - 1][index_col]
-					b = 'X' in self.grid[index_row + 1][index_col]
-					r = 'X' in row[index_col + 1]
-					l = 'X' in row[index_col - 1]
-
-					tile_type = 'o'
-
-					# all sides
-					if all((t,r,b,l)): tile_type = 'x'
-
-					# horizontal tiles only
-					if l and not any((t,r,b)): tile_type = 'r'
-					if r and not any((t,l,b)): tile_type = 'l'
-					if r and l and not any((t,b)): tile_type = 'lr'
-
-					# vertical only 
-					if t and not any((r,l,b)): tile_type = 'b'
-					if b and not any((r,l,t)): tile_type = 't'
-					if b and t and not any((r,l)): tile_type = 'tb'
-
-					# corners 
-					if l and b and not any((t,r)): tile_type = 'tr'
-					if r and b and not any((t,l)): tile_type = 'tl'
-					if l and t and not any((b,r)): tile_type = 'br'
-					if r and t and not any((b,l)): tile_type = 'bl'
-
-					# T shapes
-					if all((t,b,r)) and not l: tile_type = 'tbr'
-					if all((t,b,l)) and not r: tile_type = 'tbl'
-					if all((l,r,t)) and not b: tile_type = 'lrb'
-					if all((l,r,b)) and not t: tile_type = 'lrt'
-
-					SoilTile(
-						pos = (index_col * TILE_SIZE,index_row * TILE_SIZE), 
-						surf = self.soil_surfs[tile_type], 
-						groups = [self.all_sprites, self.soil_sprites])
\ No newline at end of file
+		for tile in self.soil_sprites.sprites():
+			tile.kill()
+		for x, y in self.soil_grid.positions('X'):
+			self.update_soil_tile(x, y)
@@ -0,0 +1,84 @@
+import pygame
+from settings import *
+
+class CollisionGroup(pygame.sprite.Group):
+	"""Sprite group that also keeps a uniform grid index of member hitboxes.
+
+	Hitboxes are treated as static: sprites that replace their hitbox after
+	joining the group (growing plants, felled trees) must call
+	`refresh_hitbox(sprite)` so the index follows them.
+	"""
+
+	def __init__(self, cell_size = TILE_SIZE):
+		super().__init__()
+		self.cell_size = cell_size
+		self.cells = {}
+		self.sprite_cells = {}
+		self.order = {}
+		self.counter = 0
+		# `hitbox` is assigned after Sprite.__init__ joins the group,
+		# so new members are indexed lazily on the next query.
+		self.pending = {}
+
+	def add_internal(self, sprite, layer = None):
+		super().add_internal(sprite, layer)
+		self.counter += 1
+		self.order[sprite] = self.counter
+		self.pending[sprite] = None
+
+	def remove_internal(self, sprite):
+		super().remove_internal(sprite)
+		self.order.pop(sprite, None)
+		self.pending.pop(sprite, None)
+		self.unindex(sprite)
+
+	def cells_for(self, rect):
+		size = self.cell_size
+		for y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+			for x in range(rect.left // size, (rect.right - 1) // size + 1):
+				yield (x, y)
+
+	def index(self, sprite):
+		self.unindex(sprite)
+		hitbox = getattr(sprite, 'hitbox', None)
+		if hitbox is None:
+			return
+		keys = tuple(self.cells_for(hitbox))
+		for key in keys:
+			self.cells.setdefault(key, set()).add(sprite)
+		self.sprite_cells[sprite] = keys
+
+	def unindex(self, sprite):
+		for key in self.sprite_cells.pop(sprite, ()):
+			cell = self.cells.get(key)
+			if cell is not None:
+				cell.discard(sprite)
+				if not cell:
+					del self.cells[key]
+
+	def refresh(self, sprite):
+		if sprite in self.order:
+			self.pending.pop(sprite, None)
+			self.index(sprite)
+
+	def flush_pending(self):
+		if self.pending:
+			for sprite in self.pending:
+				self.index(sprite)
+			self.pending.clear()
+
+	def nearby(self, rect):
+		"""Sprites whose indexed cells touch `rect` (plus a one-cell margin), in insertion order."""
+		self.flush_pending()
+		area = rect.inflate(self.cell_size * 2, self.cell_size * 2)
+		found = set()
+		for key in self.cells_for(area):
+			cell = self.cells.get(key)
+			if cell:
+				found.update(cell)
+		return sorted(found, key = self.order.__getitem__)
+
+def refresh_hitbox(sprite):
+	for group in sprite.groups():
+		if isinstance(group, CollisionGroup):
+			group.refresh(sprite)
@@ -1,7 +1,12 @@
+import weakref
 import pygame
+import settings
 from settings import *
 from random import randint, choice, shuffle
-from timer import Timer
+from timer import Timer, get_ticks
+from support import load_image, load_sound, ignore_dirty
+from spatial import refresh_hitbox
+from mapcache import bake_chunks
 
 class Generic(pygame.sprite.Sprite):
 	def __init__(self, pos, surf, groups, z = LAYERS['main']):
@@ -17,71 +22,120 @@ class Generic(pygame.sprite.Sprite):
 		self.z = z
 		self.hitbox = self.rect.copy().inflate(-self.rect.width * 0.2, -self.rect.height * 0.75)
 
+class Collider(pygame.sprite.Sprite):
+	# invisible, hitbox-only obstacle (the map's Fence/Collision tiles)
+	def __init__(self, hitbox, groups):
+		super().__init__(groups)
+		self.rect = pygame.Rect(hitbox)
+		self.hitbox = self.rect.copy()
+
 class Interaction(Generic):
 	def __init__(self, pos, size, groups, name):
 		surf = pygame.Surface(size)
 		super().__init__(pos, surf, groups)
 		self.name = name
 
-class Water(Generic):
-	def __init__(self, pos, frames, groups):
+class Water:
+	"""Every water tile of the map, animated by one shared clock.
+
+	All tiles always showed the same frame, so each animation frame is
+	pre-rendered once into MAP_CHUNK_SIZE chunks and the camera blits the
+	chunks of the current frame that overlap the view.
+	"""
+	def __init__(self, positions, frames, all_sprites):
 
 		#animation setup
 		self.frames = frames
 		self.frame_index = 0
 
-		# sprite setup
-		super().__init__(
-				pos = pos, 
-				surf = self.frames[self.frame_index], 
-				groups = groups, 
-				z = LAYERS['water']) 
+		rects = [frames[0].get_rect(topleft = pos) for pos in positions]
+		self.chunks = [
+			[(surf, surf.get_rect(topleft = topleft)) for topleft, surf in bake_chunks([(rect, frame) for rect in rects], MAP_CHUNK_SIZE)]
+			for frame in frames]
+		self.tiles = len(rects)
+
+		all_sprites.add_layer_drawer(LAYERS['water'], self.draw)
 
 	def animate(self,dt):
 		self.frame_index += 5 * dt
 		if self.frame_index >= len(self.frames):
 			self.frame_index = 0
-		self.image = self.frames[int(self.frame_index)]
 
 	def update(self,dt):
 		self.animate(dt)
 
+	def draw(self, surface, offset, camera_rect):
+		blits = []
+		for surf, rect in self.chunks[int(self.frame_index)]:
+			if rect.colliderect(camera_rect):
+				offset_rect = rect.copy()
+				offset_rect.center -= offset
+				blits.append((surf, offset_rect))
+		surface.blits(blits, False)
+
 class WildFlower(Generic):
 	def __init__(self, pos, surf, groups):
 		super().__init__(pos, surf, groups)
 		self.hitbox = self.rect.copy().inflate(-20,-self.rect.height * 0.9)
 
+# source surface -> white silhouette; particles only flash a few fixed images
+# (apple, plant frames, trees), so each mask is built once
+_silhouettes = weakref.WeakKeyDictionary()
+
+def silhouette(surf):
+	flash = _silhouettes.get(surf)
+	if flash is None:
+		flash = pygame.mask.from_surface(surf).to_surface()
+		flash.set_colorkey((0,0,0))
+		_silhouettes[surf] = flash
+	return flash
+
 class Particle(Generic):
+	# finished particles, handed out again by Particle.emit()
+	pool = []
+
 	def __init__(self, pos, surf, groups, z, duration = 200):
-		super().__init__(pos, surf, groups, z)
-		self.start_time = pygame.time.get_ticks()
+		# white surface 
+		super().__init__(pos, silhouette(surf), groups, z)
+		self.start_time = get_ticks()
 		self.duration = duration
 
-		# white surface 
-		mask_surf = pygame.mask.from_surface(self.image)
-		new_surf = mask_surf.to_surface()
-		new_surf.set_colorkey((0,0,0))
-		self.image = new_surf
+	@classmethod
+	def emit(cls, pos, surf, groups, z, duration = 200):
+		if not cls.pool:
+			return cls(pos, surf, groups, z, duration)
+		particle = cls.pool.pop()
+		particle.draw_group = groups[0] if isinstance(groups, (list, tuple)) and groups else groups
+		particle.image = silhouette(surf)
+		particle.rect = particle.image.get_rect(topleft = pos)
+		particle.z = z
+		particle.start_time = get_ticks()
+		particle.duration = duration
+		particle.add(groups)
+		return particle
 
 	def update(self,dt):
-		current_time = pygame.time.get_ticks()
+		current_time = get_ticks()
 		if current_time - self.start_time > self.duration:
 			self.kill()
+			Particle.pool.append(self)
 
 class Tree(Generic):
-	def __init__(self, pos, surf, groups, name, player_add):
+	def __init__(self, pos, surf, groups, name, player_add, mark_dirty = None):
 		super().__init__(pos, surf, groups)
 		self.name = name
+		self.mark_dirty = mark_dirty or ignore_dirty
 
 		# tree attributes
 		self.health = 5
 		self.alive = True
+		self.tree_surf = surf
 		stump_path = f'../graphics/stumps/{"small" if name == "Small" else "large"}.png'
-		self.stump_surf = pygame.image.load(stump_path).convert_alpha()
+		self.stump_surf = load_image(stump_path)
 
 		# apples
 		try:
-			self.apple_surf = pygame.image.load('../graphics/fruit/apple.png').convert_alpha()
+			self.apple_surf = load_image('../graphics/fruit/apple.png')
 		except:
 			self.apple_surf = pygame.Surface((16, 16), pygame.SRCALPHA)
 			pygame.draw.circle(self.apple_surf, (220, 0, 0), (8, 8), 7)
@@ -92,17 +146,18 @@ class Tree(Generic):
 		self.player_add = player_add
 
 		# sounds
-		self.axe_sound = pygame.mixer.Sound('../audio/axe.mp3')
-		self.axe_sound.set_volume(SFX_VOLUME)
+		self.axe_sound = load_sound('../audio/axe.mp3')
+		self.axe_sound.set_volume(settings.SFX_VOLUME)
 
 	def damage(self):
 		
 		# damaging the tree
 		self.health -= 1
+		self.mark_dirty('trees')
 
 		# play sound
 		try:
-			self.axe_sound.set_volume(SFX_VOLUME)
+			self.axe_sound.set_volume(settings.SFX_VOLUME)
 		except Exception:
 			pass
 		self.axe_sound.play()
@@ -110,7 +165,7 @@ class Tree(Generic):
 		# remove an apple
 		if len(self.apple_sprites.sprites()) > 0:
 			random_apple = choice(self.apple_sprites.sprites())
-			Particle(
+			Particle.emit(
 				pos = random_apple.rect.topleft,
 				surf = random_apple.image, 
 				groups = self.draw_group, 
@@ -118,13 +173,18 @@ class Tree(Generic):
 			self.player_add('apple')
 			random_apple.kill()
 
+	def become_stump(self):
+		self.image = self.stump_surf
+		self.rect = self.image.get_rect(midbottom = self.rect.midbottom)
+		self.hitbox = self.rect.copy().inflate(-10,-self.rect.height * 0.6)
+		refresh_hitbox(self)
+		self.alive = False
+
 	def check_death(self):
 		if self.health <= 0:
-			Particle(self.rect.topleft, self.image, self.draw_group, LAYERS['fruit'], 300)
-			self.image = self.stump_surf
-			self.rect = self.image.get_rect(midbottom = self.rect.midbottom)
-			self.hitbox = self.rect.copy().inflate(-10,-self.rect.height * 0.6)
-			self.alive = False
+			Particle.emit(self.rect.topleft, self.image, self.draw_group, LAYERS['fruit'], 300)
+			self.become_stump()
+			self.mark_dirty('trees')
 			self.player_add('wood')
 
 	def update(self,dt):
@@ -179,6 +239,14 @@ class Tree(Generic):
 				groups=[self.apple_sprites, self.draw_group],
 				z=LAYERS['fruit'])
 
+	def state_keys(self):
+		# saves store the topleft of whatever was shown: the tree or its stump
+		keys = []
+		for surf in (self.tree_surf, self.stump_surf):
+			rect = surf.get_rect(midbottom = self.rect.midbottom)
+			keys.append((getattr(self, 'name', None), int(rect.x), int(rect.y)))
+		return keys
+
 	def serialize_state(self):
 		apples = []
 		for apple in self.apple_sprites.sprites():
@@ -206,15 +274,24 @@ class Tree(Generic):
 
 		# Ensure correct stump appearance if dead
 		if self.health <= 0 or not self.alive:
-			self.check_death()
+			# already felled in the save: no wood, no falling particle
+			if self.image is not self.stump_surf:
+				self.become_stump()
+			self.alive = False
+		elif self.image is self.stump_surf:
+			# in-place reload: a stump that is alive in the save grows back
+			self.image = self.tree_surf
+			self.rect = self.image.get_rect(midbottom = self.rect.midbottom)
+			self.hitbox = self.rect.copy().inflate(-self.rect.width * 0.2, -self.rect.height * 0.75)
+			refresh_hitbox(self)
 
 		# Restore apples exactly
 		for apple in self.apple_sprites.sprites():
 			apple.kill()
 		self.apple_sprites.empty()
 
-		apples = state.get('apples', [])
-		if isinstance(apples, list) and apples:
+		apples = state.get('apples')
+		if isinstance(apples, list):
 			for rel in apples:
 				if not (isinstance(rel, (list, tuple)) and len(rel) == 2):
 					continue
@@ -225,6 +302,6 @@ class Tree(Generic):
 					surf=self.apple_surf,
 					groups=[self.apple_sprites, self.draw_group],
 					z=LAYERS['fruit'])
-		else:
-			# Fallback: regenerate
+		elif self.alive:
+			# Fallback for saves without apple data: regenerate
 			self.create_fruit()
\ No newline at end of file
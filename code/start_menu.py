@@ -4,6 +4,7 @@ import pygame
 
 import settings
 import save_system
+from support import load_image, render_text
 
 
 class StartMenu:
@@ -14,7 +15,7 @@ class StartMenu:
 
 		# background tile
 		try:
-			self.bg_tile = pygame.image.load(self._abs('../graphics/world/ground.png')).convert()
+			self.bg_tile = load_image(self._abs('../graphics/world/ground.png'), alpha=False)
 		except:
 			self.bg_tile = None
 
@@ -25,7 +26,7 @@ class StartMenu:
 		# menu pages
 		self.page = 'main'  # 'main' | 'settings' | 'load' | 'confirm_delete'
 		self.main_options = ['Mulai Game', 'Load Game', 'Pengaturan', 'Keluar']
-		self.settings_options = ['Resolusi', 'Volume Music', 'Volume SFX', 'Kembali']
+		self.settings_options = ['Resolusi', 'Volume Music', 'Volume SFX', 'FPS', 'Kembali']
 		self.load_options = []
 		self.confirm_options = ['Ya', 'Tidak']
 		self._confirm_slot = None
@@ -38,7 +39,7 @@ class StartMenu:
 		self.res_index = self.resolutions.index(current) if current in self.resolutions else 0
 
 	def refresh_save_state(self):
-		self.load_options = [save_system.format_slot_label(i) for i in save_system.list_slots()] + ['Kembali']
+		self.load_options = save_system.format_slot_labels() + ['Kembali']
 		self.index = max(0, min(self.index, len(self._current_options()) - 1))
 
 	@staticmethod
@@ -63,6 +64,20 @@ class StartMenu:
 	def _sfx_label(self):
 		return f'Volume SFX: {self._pct(settings.SFX_VOLUME)}%'
 
+	@staticmethod
+	def _fps_label():
+		return f'FPS: {settings.FPS_CAP}' if settings.FPS_CAP else 'FPS: Tanpa batas'
+
+	@staticmethod
+	def _step_fps(step: int):
+		options = list(settings.FPS_OPTIONS)
+		index = options.index(settings.FPS_CAP) if settings.FPS_CAP in options else 0
+		settings.FPS_CAP = options[(index + step) % len(options)]
+		try:
+			save_system.save_settings({'fps_cap': int(settings.FPS_CAP)})
+		except Exception:
+			pass
+
 	def _current_options(self):
 		if self.page == 'main':
 			return self.main_options
@@ -227,6 +242,15 @@ class StartMenu:
 					pass
 				return None
 
+			# FPS cap
+			if current_opt == 'FPS' and event.key in (pygame.K_a, pygame.K_LEFT):
+				self._step_fps(-1)
+				return None
+
+			if current_opt == 'FPS' and event.key in (pygame.K_d, pygame.K_RIGHT):
+				self._step_fps(1)
+				return None
+
 		if event.key == pygame.K_RETURN:
 			if self.page == 'main':
 				if current_opt == 'Mulai Game':
@@ -284,6 +308,9 @@ class StartMenu:
 					except Exception:
 						pass
 					return None
+				if current_opt == 'FPS':
+					self._step_fps(1)
+					return None
 			else:
 				if self.page == 'load':
 					# load page
@@ -319,7 +346,7 @@ class StartMenu:
 					self.display_surface.blit(self.bg_tile, (x, y))
 
 		# title
-		title_surf = self.title_font.render('MEOW VALLEY', True, 'Black')
+		title_surf = render_text(self.title_font, 'MEOW VALLEY', True, 'Black')
 		title_rect = title_surf.get_rect(center=(settings.SCREEN_WIDTH // 2, 140))
 		self.display_surface.blit(title_surf, title_rect)
 
@@ -328,7 +355,7 @@ class StartMenu:
 		options = self._current_options()
 		if self.page == 'confirm_delete' and self._confirm_slot is not None:
 			msg = f'Hapus Slot {int(self._confirm_slot)}?'
-			msg_surf = self.font.render(msg, True, 'White')
+			msg_surf = render_text(self.font, msg, True, 'White')
 			msg_rect = msg_surf.get_rect(center=(settings.SCREEN_WIDTH // 2, 260))
 			self.display_surface.blit(msg_surf, msg_rect)
 			start_y = 320
@@ -340,11 +367,13 @@ class StartMenu:
 					label = self._music_label()
 				elif opt == 'Volume SFX':
 					label = self._sfx_label()
+				elif opt == 'FPS':
+					label = self._fps_label()
 				else:
 					label = opt
 			else:
 				label = opt
 			color = '#FFEB3B' if i == self.index else 'White'
-			surf = self.font.render(label, True, color)
+			surf = render_text(self.font, label, True, color)
 			rect = surf.get_rect(center=(settings.SCREEN_WIDTH // 2, start_y + i * self.spacing))
 			self.display_surface.blit(surf, rect)
@@ -1,24 +1,131 @@
 from os import walk
+import os
+from collections import OrderedDict
 import pygame
 
+import settings
+
+# Process-wide asset cache: surfaces, frame lists and sounds are loaded from
+# disk once and shared by every sprite that asks for the same file.
+_assets = {}
+_asset_stats = {'hits': 0, 'misses': 0}
+
+def _cached(kind, path, loader):
+	key = (kind, os.path.abspath(path))
+	if key in _assets:
+		_asset_stats['hits'] += 1
+		return _assets[key]
+	_asset_stats['misses'] += 1
+	asset = loader()
+	_assets[key] = asset
+	return asset
+
+def asset_stats():
+	return {
+		'hits': _asset_stats['hits'],
+		'misses': _asset_stats['misses'],
+		'entries': len(_assets),
+	}
+
+def clear_asset_cache():
+	_assets.clear()
+	_asset_stats['hits'] = 0
+	_asset_stats['misses'] = 0
+
+def load_image(path, alpha = True):
+	"""Load (and convert) an image once; later calls return the same Surface."""
+	if alpha:
+		return _cached('image_alpha', path, lambda: pygame.image.load(path).convert_alpha())
+	return _cached('image', path, lambda: pygame.image.load(path).convert())
+
+# Rendered text, most recently used last. Menu and HUD labels rarely change,
+# so a frame usually renders nothing and only blits cached surfaces.
+_text_cache = OrderedDict()
+_text_stats = {'hits': 0, 'misses': 0}
+
+def render_text(font, text, antialias, color):
+	"""`font.render(text, antialias, color)`, cached by (font, text, antialias, color).
+
+	The returned Surface is shared; blit it, don't draw on it.
+	"""
+	if isinstance(color, list):
+		color = tuple(color)
+	key = (font, text, antialias, color)
+	surf = _text_cache.get(key)
+	if surf is not None:
+		_text_stats['hits'] += 1
+		_text_cache.move_to_end(key)
+		return surf
+	_text_stats['misses'] += 1
+	surf = font.render(text, antialias, color)
+	_text_cache[key] = surf
+	while len(_text_cache) > settings.TEXT_CACHE_SIZE:
+		_text_cache.popitem(last = False)
+	return surf
+
+def text_stats():
+	return {
+		'hits': _text_stats['hits'],
+		'misses': _text_stats['misses'],
+		'entries': len(_text_cache),
+	}
+
+def clear_text_cache():
+	_text_cache.clear()
+	_text_stats['hits'] = 0
+	_text_stats['misses'] = 0
+
+def ignore_dirty(part):
+	"""Default `mark_dirty` for sprites and layers built outside a Level."""
+	pass
+
+class SilentSound:
+	"""Stand-in for pygame.mixer.Sound when no audio device/mixer is available."""
+
+	def play(self, *args, **kwargs):
+		return None
+
+	def stop(self):
+		pass
+
+	def fadeout(self, ms):
+		pass
+
+	def set_volume(self, value):
+		pass
+
+	def get_volume(self):
+		return 0.0
+
+def load_sound(path):
+	if pygame.mixer.get_init() is None:
+		return SilentSound()
+	return _cached('sound', path, lambda: pygame.mixer.Sound(path))
+
 def import_folder(path):
-	surface_list = []
+	def load():
+		surface_list = []
 
-	for _, __, img_files in walk(path):
-		for image in img_files:
-			full_path = path + '/' + image
-			image_surf = pygame.image.load(full_path).convert_alpha()
-			surface_list.append(image_surf)
+		for _, __, img_files in walk(path):
+			for image in img_files:
+				full_path = path + '/' + image
+				image_surf = load_image(full_path)
+				surface_list.append(image_surf)
 
-	return surface_list
+		return surface_list
+
+	return list(_cached('folder', path, load))
 
 def import_folder_dict(path):
-	surface_dict = {}
+	def load():
+		surface_dict = {}
+
+		for _, __, img_files in walk(path):
+			for image in img_files:
+				full_path = path + '/' + image
+				image_surf = load_image(full_path)
+				surface_dict[image.split('.')[0]] = image_surf
 
-	for _, __, img_files in walk(path):
-		for image in img_files:
-			full_path = path + '/' + image
-			image_surf = pygame.image.load(full_path).convert_alpha()
-			surface_dict[image.split('.')[0]] = image_surf
+		return surface_dict
 
-	return surface_dict
\ No newline at end of file
+	return dict(_cached('folder_dict', path, load))
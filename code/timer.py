@@ -1,5 +1,16 @@
 import pygame 
 
+# Millisecond clock used by all gameplay timers. Headless simulation swaps
+# this for a virtual clock so fixed-step runs don't depend on wall time.
+_clock = pygame.time.get_ticks
+
+def get_ticks():
+	return _clock()
+
+def set_clock(clock = None):
+	global _clock
+	_clock = clock or pygame.time.get_ticks
+
 class Timer:
 	def __init__(self,duration,func = None):
 		self.duration = duration
@@ -9,15 +20,15 @@ class Timer:
 
 	def activate(self):
 		self.active = True
-		self.start_time = pygame.time.get_ticks()
+		self.start_time = get_ticks()
 
 	def deactivate(self):
 		self.active = False
 		self.start_time = 0
 
 	def update(self):
-		current_time = pygame.time.get_ticks()
+		current_time = get_ticks()
 		if current_time - self.start_time >= self.duration:
 			if self.func and self.start_time != 0:
 				self.func()
-			self.deactivate()
\ No newline at end of file
+			self.deactivate()
@@ -1,20 +1,24 @@
 import pygame
+import settings
 from settings import *
 
 class Transition:
 	def __init__(self, reset, player):
 		
 		# setup
-		self.display_surface = pygame.display.get_surface()
 		self.reset = reset
 		self.player = player
 
 		# overlay image
-		self.image = pygame.Surface((SCREEN_WIDTH,SCREEN_HEIGHT))
+		self.resize()
 		self.color = 255
 		self.speed = -2
 
-	def play(self):
+	def resize(self):
+		self.display_surface = pygame.display.get_surface()
+		self.image = pygame.Surface((settings.SCREEN_WIDTH,settings.SCREEN_HEIGHT))
+
+	def update(self):
 		self.color += self.speed
 		if self.color <= 0:
 			self.speed *= -1
@@ -25,5 +29,6 @@ class Transition:
 			self.player.sleep = False
 			self.speed = -2
 
+	def draw(self):
 		self.image.fill((self.color,self.color,self.color))
-		self.display_surface.blit(self.image, (0,0), special_flags = pygame.BLEND_RGBA_MULT)
\ No newline at end of file
+		self.display_surface.blit(self.image, (0,0), special_flags = pygame.BLEND_RGBA_MULT)